@@ -0,0 +1,25 @@
+"""
+Nu3PBnB Python client package
+
+Submodules are imported on first use so that ``import nu3pbnb`` (and the
+``nu3pbnb`` command) stay cheap; ``requests`` and NumPy are only loaded when
+something actually needs them.
+"""
+
+__version__ = '1.0.0'
+
+__all__ = ['Nu3PBnBAPI', 'HostAnalytics']
+
+_LAZY = {
+    'Nu3PBnBAPI': 'client',
+    'HostAnalytics': 'analytics',
+    'BookingWatcher': 'watcher',
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(f'.{module}', __name__), name)
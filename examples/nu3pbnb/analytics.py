@@ -0,0 +1,305 @@
+"""
+Nu3PBnB Host Analytics
+Portfolio revenue and occupancy metrics computed client-side from listings,
+bookings and payments fetched through Nu3PBnBAPI
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Booking statuses that hold the listing for their nights
+OCCUPIED_STATUSES = ('approved', 'confirmed')
+
+# Payment statuses whose amount (less any refund) counts as revenue
+SETTLED_PAYMENT_STATUSES = ('completed', 'refunded')
+
+# Listings are filtered by language unless one is given, so fetch each
+LISTING_LANGUAGES = ('en', 'fr', 'es')
+
+CACHE_VERSION = 1
+
+
+def _ref_id(value) -> str:
+    """Return the id of a reference that may or may not be populated"""
+    if isinstance(value, dict):
+        return str(value.get('_id') or '')
+    return str(value or '')
+
+
+def _day(value: Optional[str]) -> str:
+    """Truncate an ISO timestamp to its date part"""
+    return (value or '')[:10]
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division that yields 0 where the denominator is 0"""
+    numerator = np.asarray(numerator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def _summarize(occupied, revenue, available, count, cancelled, lead_days) -> Dict[str, np.ndarray]:
+    """Derive the reported metrics from the summed counters"""
+    revenue = np.asarray(revenue, dtype=float)
+    return {
+        'occupiedNights': occupied,
+        'availableNights': available,
+        'revenue': revenue,
+        'occupancy': _ratio(occupied, available),
+        'adr': _ratio(revenue, occupied),
+        'revpar': _ratio(revenue, available),
+        'bookings': count,
+        'avgLeadTimeDays': _ratio(lead_days, count),
+        'cancellationRate': _ratio(cancelled, count),
+    }
+
+
+def _row(table: Dict[str, np.ndarray], index=()) -> Dict:
+    """Pick one cell out of a summarized table as plain Python numbers"""
+    row = {}
+    for key, values in table.items():
+        value = np.asarray(values)[index]
+        row[key] = round(float(value), 4) if value.dtype.kind == 'f' else int(value)
+    return row
+
+
+def group_by_host(bookings: List[Dict], payments: List[Dict],
+                  listings: Optional[List[Dict]] = None) -> Dict[str, Tuple[List[Dict], List[Dict], List[str]]]:
+    """Split bookings, payments and listing ids into per-host buckets"""
+    groups: Dict[str, Tuple[List[Dict], List[Dict], List[str]]] = {}
+    booking_host: Dict[str, str] = {}
+
+    for listing in listings or []:
+        host_id = _ref_id(listing.get('host'))
+        if host_id:
+            groups.setdefault(host_id, ([], [], []))[2].append(_ref_id(listing.get('_id')))
+
+    for booking in bookings:
+        listing = booking.get('listing')
+        host_id = _ref_id(booking.get('host')) or _ref_id(listing.get('host') if isinstance(listing, dict) else None)
+        if not host_id:
+            continue
+        booking_host[_ref_id(booking.get('_id'))] = host_id
+        groups.setdefault(host_id, ([], [], []))[0].append(booking)
+
+    for payment in payments:
+        host_id = booking_host.get(_ref_id(payment.get('booking')))
+        if host_id:
+            groups[host_id][1].append(payment)
+
+    return groups
+
+
+def compute_host_metrics(bookings: List[Dict], payments: List[Dict], start: str, end: str,
+                         listing_ids: Optional[List[str]] = None) -> Dict:
+    """
+    Compute occupancy, ADR, RevPAR, lead time and cancellation rate for one
+    host, per listing and per calendar month, over the [start, end) window.
+
+    Nights and revenue are attributed to the month each night falls in;
+    lead time and cancellations are attributed to the check-in month.
+    ``listing_ids`` are the host's listings, each of which contributes
+    available nights whether booked or not; without them only the listings
+    that appear in ``bookings`` are known.
+    """
+    start_day = np.datetime64(start, 'D')
+    end_day = np.datetime64(end, 'D')
+    if end_day <= start_day:
+        raise ValueError('end must be after start')
+
+    months = np.arange(start_day.astype('datetime64[M]'), (end_day - 1).astype('datetime64[M]') + 1)
+    month_starts = np.maximum(months.astype('datetime64[D]'), start_day)
+    month_ends = np.minimum((months + 1).astype('datetime64[D]'), end_day)
+    available_per_month = (month_ends - month_starts).astype(np.int64)
+    month_labels = [str(month) for month in months]
+
+    listing_ids = sorted(set(listing_ids or ()) | {_ref_id(booking.get('listing')) for booking in bookings})
+    listing_index = {listing_id: i for i, listing_id in enumerate(listing_ids)}
+    n_listings, n_months, n_bookings = len(listing_ids), len(months), len(bookings)
+    cells = n_listings * n_months
+
+    listing = np.fromiter((listing_index[_ref_id(b.get('listing'))] for b in bookings), dtype=np.int64, count=n_bookings)
+    check_in = np.array([_day(b.get('startDate')) for b in bookings], dtype='datetime64[D]')
+    check_out = np.array([_day(b.get('endDate')) for b in bookings], dtype='datetime64[D]')
+    created = np.array([_day(b.get('createdAt')) or _day(b.get('startDate')) for b in bookings], dtype='datetime64[D]')
+    status = np.array([b.get('status') or 'pending' for b in bookings], dtype=object)
+    total_price = np.fromiter((float(b.get('totalPrice') or 0) for b in bookings), dtype=float, count=n_bookings)
+
+    occupied = np.isin(status, OCCUPIED_STATUSES)
+    cancelled = status == 'cancelled'
+    nights = np.maximum((check_out - check_in).astype(np.int64), 0)
+
+    # Net settled payments per booking; bookings with no payment on record
+    # fall back to their quoted total price
+    position = {_ref_id(b.get('_id')): i for i, b in enumerate(bookings)}
+    paid = np.zeros(n_bookings)
+    has_payment = np.zeros(n_bookings, dtype=bool)
+    for payment in payments:
+        i = position.get(_ref_id(payment.get('booking')))
+        if i is None:
+            continue
+        has_payment[i] = True
+        if payment.get('paymentStatus') in SETTLED_PAYMENT_STATUSES:
+            paid[i] += float(payment.get('amount') or 0) - float(payment.get('refundAmount') or 0)
+    revenue = np.where(has_payment, paid, total_price) * occupied
+    nightly_rate = _ratio(revenue, nights)
+
+    # Expand occupied bookings into one entry per night
+    stays = np.flatnonzero(occupied & (nights > 0))
+    stay_nights = nights[stays]
+    owner = np.repeat(stays, stay_nights)
+    offsets = np.arange(owner.size) - np.repeat(np.cumsum(stay_nights) - stay_nights, stay_nights)
+    night_dates = check_in[owner] + offsets
+    in_window = (night_dates >= start_day) & (night_dates < end_day)
+    owner, night_dates = owner[in_window], night_dates[in_window]
+    night_cell = listing[owner] * n_months + (night_dates.astype('datetime64[M]') - months[0]).astype(np.int64)
+
+    occupied_nights = np.bincount(night_cell, minlength=cells).reshape(n_listings, n_months)
+    night_revenue = np.bincount(night_cell, weights=nightly_rate[owner], minlength=cells).reshape(n_listings, n_months)
+
+    # Booking-level counters keyed by check-in month
+    in_window = (check_in >= start_day) & (check_in < end_day)
+    booking_cell = listing[in_window] * n_months + (check_in[in_window].astype('datetime64[M]') - months[0]).astype(np.int64)
+    lead_days = np.maximum((check_in - created).astype(np.int64), 0)
+    booking_count = np.bincount(booking_cell, minlength=cells).reshape(n_listings, n_months)
+    cancel_count = np.bincount(booking_cell, weights=cancelled[in_window], minlength=cells).reshape(n_listings, n_months)
+    lead_total = np.bincount(booking_cell, weights=lead_days[in_window], minlength=cells).reshape(n_listings, n_months)
+
+    available = np.broadcast_to(available_per_month, (n_listings, n_months))
+    monthly = _summarize(occupied_nights, night_revenue, available, booking_count, cancel_count, lead_total)
+    per_listing = _summarize(
+        occupied_nights.sum(axis=1), night_revenue.sum(axis=1), available.sum(axis=1),
+        booking_count.sum(axis=1), cancel_count.sum(axis=1), lead_total.sum(axis=1)
+    )
+    overall = _summarize(
+        occupied_nights.sum(), night_revenue.sum(), available.sum(),
+        booking_count.sum(), cancel_count.sum(), lead_total.sum()
+    )
+
+    return {
+        'start': str(start_day),
+        'end': str(end_day),
+        'listings': {
+            listing_id: {
+                'total': _row(per_listing, i),
+                'monthly': {label: _row(monthly, (i, m)) for m, label in enumerate(month_labels)},
+            }
+            for listing_id, i in listing_index.items()
+        },
+        'total': _row(overall),
+    }
+
+
+def _compute_job(job: Tuple[List[Dict], List[Dict], str, str, List[str]]) -> Dict:
+    """Process pool entry point"""
+    return compute_host_metrics(*job)
+
+
+def _fingerprint(bookings: List[Dict], payments: List[Dict], start: str, end: str, listing_ids: List[str]) -> str:
+    """Hash the fields the metrics depend on, so unchanged hosts can be skipped"""
+    projection = {
+        'window': [start, end],
+        'listings': sorted(listing_ids),
+        'bookings': sorted(
+            [_ref_id(b.get('_id')), _ref_id(b.get('listing')), b.get('status'), b.get('startDate'),
+             b.get('endDate'), b.get('createdAt'), b.get('totalPrice'), b.get('updatedAt')]
+            for b in bookings
+        ),
+        'payments': sorted(
+            [_ref_id(p.get('_id')), _ref_id(p.get('booking')), p.get('paymentStatus'),
+             p.get('amount'), p.get('refundAmount'), p.get('updatedAt')]
+            for p in payments
+        ),
+    }
+    encoded = json.dumps(projection, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class HostAnalytics:
+    """
+    Portfolio analytics across many hosts.
+
+    Hosts are computed in parallel on a process pool, and each host's result
+    is cached against a fingerprint of its input so that repeated runs only
+    recompute hosts whose listings, bookings or payments changed. With a
+    ``cache_path`` the cache is kept in a JSON file and so also carries over
+    between processes, e.g. successive CLI runs.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache_path: Optional[str] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_path = cache_path
+        self._cache: Dict[str, Tuple[str, Dict]] = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, encoding='utf-8') as handle:
+                data = json.load(handle)
+            if data.get('version') == CACHE_VERSION:
+                self._cache = {host_id: tuple(entry) for host_id, entry in data['hosts'].items()}
+
+    def save(self) -> None:
+        """Write the cache atomically to ``cache_path``"""
+        if not self.cache_path:
+            return
+        temporary = f"{self.cache_path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            json.dump({'version': CACHE_VERSION, 'hosts': self._cache}, handle, separators=(',', ':'))
+        os.replace(temporary, self.cache_path)
+
+    def compute(self, bookings: List[Dict], payments: List[Dict], start: str, end: str,
+                listings: Optional[List[Dict]] = None) -> Dict[str, Dict]:
+        """Compute metrics for every host present in the given data"""
+        results: Dict[str, Dict] = {}
+        stale = []
+
+        for host_id, (host_bookings, host_payments, host_listings) in group_by_host(bookings, payments,
+                                                                                    listings).items():
+            digest = _fingerprint(host_bookings, host_payments, start, end, host_listings)
+            cached = self._cache.get(host_id)
+            if cached and cached[0] == digest:
+                results[host_id] = cached[1]
+            else:
+                stale.append((host_id, digest, (host_bookings, host_payments, start, end, host_listings)))
+
+        jobs = [job for _, _, job in stale]
+        if len(jobs) <= 1 or self.max_workers == 1:
+            computed = [_compute_job(job) for job in jobs]
+        else:
+            chunksize = max(1, len(jobs) // (self.max_workers * 4))
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                computed = list(pool.map(_compute_job, jobs, chunksize=chunksize))
+
+        for (host_id, digest, _), metrics in zip(stale, computed):
+            self._cache[host_id] = (digest, metrics)
+            results[host_id] = metrics
+
+        if stale:
+            self.save()
+        return results
+
+    def fetch(self, api, start: str, end: str, page_size: int = 100) -> Dict[str, Dict]:
+        """Fetch platform listings, bookings and payments through the client (admin token required) and compute metrics"""
+        listings = []
+        for language in LISTING_LANGUAGES:
+            page = 1
+            while True:
+                result = api.get_listings({'language': language, 'limit': page_size, 'page': page})
+                listings.extend(result.get('listings') or [])
+                if not (result.get('pagination') or {}).get('hasNext'):
+                    break
+                page += 1
+        bookings = api.get_all_bookings()
+        payments = api.get_all_payments().get('payments', [])
+        return self.compute(bookings, payments, start, end, listings)
+
+    def invalidate(self, host_id: Optional[str] = None) -> None:
+        """Drop cached results for one host, or for all hosts"""
+        if host_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(host_id, None)
+        self.save()
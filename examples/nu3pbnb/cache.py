@@ -0,0 +1,231 @@
+"""
+Nu3PBnB persistent response cache
+
+A response cache in a single SQLite database (WAL mode) that any number of
+client processes can share, so workers warm-start from each other's data
+after a restart or deploy instead of all refetching from the API.
+
+Bodies are stored zlib-compressed along with their ``ETag`` and
+``Last-Modified`` validators. Entries are fresh for their TTL; after that
+they are revalidated with a conditional request, and for a further
+``stale_ttl`` seconds one process at a time holds a lease to revalidate
+while the others keep serving the stale copy. The total stored size is
+capped and the least recently used entries are evicted first.
+
+A write through the client (POST, PUT, DELETE) drops every cached entry,
+for every user, under the prefixes that write can change, so a process sees
+its own updates immediately; other processes sharing the database see them
+on their next read.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Endpoint prefix -> TTL in seconds; endpoints not listed are never cached
+DEFAULT_TTLS = {
+    '/listings': 300,
+    '/reviews/listing': 300,
+}
+
+# Endpoint prefix of a write -> cached prefixes whose entries it makes stale.
+# Reviews update the listing's rating and bookings its availability.
+DEFAULT_INVALIDATIONS = {
+    '/listings': ('/listings',),
+    '/reviews': ('/reviews/listing', '/listings'),
+    '/bookings': ('/listings',),
+}
+
+# Sorts after any character a key can continue with, to turn a prefix into a key range
+_PREFIX_END = '\U0010ffff'
+
+# Reads only refresh an entry's LRU timestamp when it is older than this
+ACCESS_RESOLUTION = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    stale_until REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    lease_until REAL NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS stats (id INTEGER PRIMARY KEY CHECK (id = 0), total_size INTEGER NOT NULL);
+INSERT OR IGNORE INTO stats (id, total_size) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE stats SET total_size = total_size + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE stats SET total_size = total_size + NEW.size - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE stats SET total_size = total_size - OLD.size WHERE id = 0;
+END;
+"""
+
+
+class CacheEntry:
+    __slots__ = ('body', 'etag', 'last_modified', 'expires_at', 'stale_until')
+
+    def __init__(self, body: bytes, etag: Optional[str], last_modified: Optional[str],
+                 expires_at: float, stale_until: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def servable_stale(self) -> bool:
+        return time.time() < self.stale_until
+
+    def json(self):
+        return json.loads(zlib.decompress(self.body))
+
+
+class ResponseCache:
+    """SQLite-backed response cache shared by every process that opens the same path"""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, ttls: Optional[Dict[str, float]] = None,
+                 stale_ttl: float = 60.0, lease_seconds: float = 30.0, compression_level: int = 6,
+                 invalidations: Optional[Dict[str, Tuple[str, ...]]] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = sorted((ttls if ttls is not None else DEFAULT_TTLS).items(), key=lambda item: -len(item[0]))
+        self.invalidations = sorted((invalidations if invalidations is not None else DEFAULT_INVALIDATIONS).items(),
+                                    key=lambda item: -len(item[0]))
+        self.stale_ttl = stale_ttl
+        self.lease_seconds = lease_seconds
+        self.compression_level = compression_level
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, reopened after a fork"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    @staticmethod
+    def _longest_match(endpoint: str, prefixes):
+        path = endpoint.split('?', 1)[0]
+        for prefix, value in prefixes:
+            if path == prefix or path.startswith(prefix.rstrip('/') + '/'):
+                return value
+        return None
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """TTL of the longest configured prefix matching the endpoint path, or None if uncacheable"""
+        return self._longest_match(endpoint, self.ttls)
+
+    def invalidated_by(self, endpoint: str) -> Tuple[str, ...]:
+        """Cached endpoint prefixes that a write to ``endpoint`` can make stale"""
+        return self._longest_match(endpoint, self.invalidations) or ()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = self._connection().execute(
+            'SELECT body, etag, last_modified, expires_at, stale_until, accessed_at FROM entries WHERE key = ?',
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[5] > ACCESS_RESOLUTION:
+            self._connection().execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+        return CacheEntry(*row[:5])
+
+    def set(self, key: str, body: bytes, ttl: float, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        compressed = zlib.compress(body, self.compression_level)
+        if len(compressed) > self.max_bytes:
+            return
+        now = time.time()
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(
+                'INSERT INTO entries (key, body, etag, last_modified, expires_at, stale_until, accessed_at, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET body = excluded.body, etag = excluded.etag, '
+                'last_modified = excluded.last_modified, expires_at = excluded.expires_at, '
+                'stale_until = excluded.stale_until, accessed_at = excluded.accessed_at, '
+                'lease_until = 0, size = excluded.size',
+                (key, compressed, etag, last_modified, now + ttl, now + ttl + self.stale_ttl, now, len(compressed))
+            )
+            self._evict(connection)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Once over the cap, drop least recently used entries until back under 90% of it"""
+        total = connection.execute('SELECT total_size FROM stats WHERE id = 0').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * 0.9)
+        victims = []
+        for key, size in connection.execute('SELECT key, size FROM entries ORDER BY accessed_at'):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany('DELETE FROM entries WHERE key = ?', victims)
+
+    def refresh(self, key: str, ttl: float) -> None:
+        """Extend an entry after a 304 Not Modified"""
+        now = time.time()
+        self._connection().execute(
+            'UPDATE entries SET expires_at = ?, stale_until = ?, accessed_at = ?, lease_until = 0 WHERE key = ?',
+            (now + ttl, now + ttl + self.stale_ttl, now, key)
+        )
+
+    def try_lease(self, key: str) -> bool:
+        """Claim the right to revalidate a stale entry; False if another process holds it"""
+        now = time.time()
+        cursor = self._connection().execute(
+            'UPDATE entries SET lease_until = ? WHERE key = ? AND lease_until < ?',
+            (now + self.lease_seconds, key, now)
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key: str) -> None:
+        self._connection().execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def invalidate(self, url: str) -> int:
+        """Drop the entries for ``url`` and every path, query and user under it; returns how many"""
+        connection = self._connection()
+        dropped = connection.execute('DELETE FROM entries WHERE key = ?', (url,)).rowcount
+        for separator in '#/?':
+            start = url + separator
+            dropped += connection.execute('DELETE FROM entries WHERE key >= ? AND key < ?',
+                                          (start, start + _PREFIX_END)).rowcount
+        return dropped
+
+    def clear(self) -> None:
+        self._connection().execute('DELETE FROM entries')
+
+    def stats(self) -> Dict:
+        connection = self._connection()
+        count = connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        total = connection.execute('SELECT total_size FROM stats WHERE id = 0').fetchone()[0]
+        return {'entries': count, 'bytes': total, 'maxBytes': self.max_bytes}
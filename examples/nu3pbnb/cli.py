@@ -0,0 +1,427 @@
+"""
+Nu3PBnB command line interface
+
+Every subcommand imports what it needs when it runs, so that short-lived
+invocations from cron or shell pipelines do not pay for ``requests`` (or
+NumPy) unless they use it. Results are written to stdout as JSON Lines, one
+record per line, as soon as each page arrives.
+"""
+
+import argparse
+import os
+import sys
+
+from . import __version__
+
+DEFAULT_BASE_URL = 'http://localhost:3000/api'
+
+# Startup budget for ``nu3pbnb --version`` over a bare interpreter, in milliseconds
+STARTUP_BUDGET_MS = 25.0
+
+# Response keys that hold the records of a collection endpoint
+COLLECTION_KEYS = ('listings', 'featuredListings', 'bookings', 'reviews', 'messages', 'payments', 'supportedMethods')
+
+# list resource -> (client method, needs a listing id)
+LIST_RESOURCES = {
+    'listings': ('get_listings', False),
+    'popular': ('get_popular_listings', False),
+    'bookings': ('get_bookings', False),
+    'all-bookings': ('get_all_bookings', False),
+    'reviews': ('get_listing_reviews', True),
+    'messages': ('get_messages', False),
+    'payments': ('get_payment_history', False),
+    'all-payments': ('get_all_payments', False),
+    'payment-methods': ('get_payment_methods', False),
+}
+
+# export resource -> paginated client method
+EXPORT_RESOURCES = {
+    'listings': 'get_listings',
+    'payments': 'get_payment_history',
+}
+
+
+def _write(record) -> None:
+    import json
+    sys.stdout.write(json.dumps(record, separators=(',', ':'), default=str))
+    sys.stdout.write('\n')
+
+
+def emit(result) -> int:
+    """Write a response as JSON Lines, one line per record of a collection"""
+    records = result
+    if isinstance(result, dict):
+        for key in COLLECTION_KEYS:
+            if isinstance(result.get(key), list):
+                records = result[key]
+                break
+    if not isinstance(records, list):
+        records = [records]
+    for record in records:
+        _write(record)
+    sys.stdout.flush()
+    return len(records)
+
+
+def _params(pairs):
+    """Turn ``key=value`` arguments into a query dict"""
+    params = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition('=')
+        if not sep:
+            raise SystemExit(f"nu3pbnb: expected key=value, got {pair!r}")
+        params[key] = value
+    return params
+
+
+def _json_arg(value):
+    """Parse an argument as JSON, falling back to the raw string"""
+    import json
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _tracer(args):
+    if not (args.trace_file or args.trace_endpoint):
+        return None
+    from . import tracing
+    if args.trace_endpoint:
+        return tracing.otlp_http_tracer(args.trace_endpoint, sample_rate=args.trace_sample_rate)
+    return tracing.file_tracer(args.trace_file, sample_rate=args.trace_sample_rate)
+
+
+def _cache(args):
+    if not args.cache:
+        return None
+    from .cache import ResponseCache
+    return ResponseCache(args.cache)
+
+
+def _client(args):
+    from .client import Nu3PBnBAPI
+    api = Nu3PBnBAPI(args.api_key, base_url=args.base_url, tracer=_tracer(args), cache=_cache(args))
+    if args.token:
+        api.set_user_token(args.token)
+    return api
+
+
+# ===== SUBCOMMANDS =====
+
+def cmd_list(args):
+    method, needs_listing = LIST_RESOURCES[args.resource]
+    api = _client(args)
+    if needs_listing:
+        if not args.listing:
+            raise SystemExit(f"nu3pbnb: list {args.resource} requires --listing")
+        return emit(getattr(api, method)(args.listing))
+    params = _params(args.param)
+    if method in ('get_listings', 'get_bookings', 'get_payment_history'):
+        return emit(getattr(api, method)(params or None))
+    return emit(getattr(api, method)())
+
+
+def cmd_get(args):
+    api = _client(args)
+    if args.resource == 'profile':
+        return emit(api.get_profile())
+    if not args.id:
+        raise SystemExit('nu3pbnb: get listing requires an id')
+    return emit(api.get_listing(args.id))
+
+
+def cmd_search(args):
+    return emit(_client(args).search_listings(_params(args.param)))
+
+
+def cmd_book(args):
+    # The API prices the stay itself from the listing's nightly rate
+    booking = {
+        'listingId': args.listing,
+        'startDate': args.check_in,
+        'endDate': args.check_out,
+        'guests': args.guests,
+    }
+    if args.message:
+        booking['message'] = args.message
+    return emit(_client(args).create_booking(booking))
+
+
+def cmd_message(args):
+    message = {'recipient': args.recipient, 'content': args.content}
+    if args.listing:
+        message['listing'] = args.listing
+    return emit(_client(args).send_message(message))
+
+
+def cmd_export(args):
+    """Stream every page of a paginated collection"""
+    api = _client(args)
+    fetch = getattr(api, EXPORT_RESOURCES[args.resource])
+    params = _params(args.param)
+    params.setdefault('limit', str(args.page_size))
+    page, count = 1, 0
+    while True:
+        params['page'] = str(page)
+        result = fetch(params)
+        count += emit(result)
+        pagination = result.get('pagination') or {}
+        if not (pagination.get('hasNext') or page < int(pagination.get('total') or 0)):
+            break
+        page += 1
+    return count
+
+
+def cmd_login(args):
+    password = args.password or os.environ.get('NU3PBNB_PASSWORD')
+    if not password:
+        import getpass
+        password = getpass.getpass()
+    return emit(_client(args).login({'email': args.email, 'password': password}))
+
+
+def cmd_call(args):
+    """Invoke any public client method with JSON-decoded positional arguments"""
+    api = _client(args)
+    method = getattr(api, args.method, None)
+    if args.method.startswith('_') or not callable(method):
+        raise SystemExit(f"nu3pbnb: unknown client method {args.method!r}")
+    return emit(method(*[_json_arg(value) for value in args.args]))
+
+
+def cmd_wishlist(args):
+    return emit(_client(args).get_wishlist(args.user))
+
+
+def cmd_sync_wishlists(args):
+    """Sync wishlists from JSON Lines of {"userId": ..., "listingIds": [...]}"""
+    import json
+    desired = {}
+    with (sys.stdin if args.file == '-' else open(args.file, encoding='utf-8')) as handle:
+        for line in handle:
+            if line.strip():
+                entry = json.loads(line)
+                desired[str(entry['userId'])] = entry.get('listingIds') or []
+    results = _client(args).sync_wishlists(desired, max_workers=args.workers, dry_run=args.dry_run)
+    for result in results.values():
+        _write(result.to_dict())
+    return len(results)
+
+
+def cmd_watch(args):
+    """Stream booking events as JSON Lines until interrupted"""
+    from .watcher import BookingWatcher
+    watcher = BookingWatcher(_client(args), role=args.role, min_interval=args.min_interval,
+                             max_interval=args.max_interval, emit_existing=args.existing)
+    count = 0
+    for event in watcher.iter_events():
+        if not args.type or event.type in args.type:
+            _write(event.to_dict())
+            sys.stdout.flush()
+            count += 1
+    return count
+
+
+def cmd_analytics(args):
+    from .analytics import HostAnalytics
+    analytics = HostAnalytics(max_workers=args.workers, cache_path=args.cache_file)
+    results = analytics.fetch(_client(args), args.start, args.end)
+    for host_id, metrics in results.items():
+        _write({'host': host_id, **metrics})
+    return len(results)
+
+
+def cmd_seed(args):
+    """Create a synthetic dataset, or print its records with --dry-run"""
+    from .seed import SeedPlan, seed
+    plan = SeedPlan(seed=args.seed, hosts=args.hosts, guests=args.guests, listings=args.listings,
+                    bookings_per_listing=args.bookings_per_listing, review_rate=args.review_rate,
+                    message_rate=args.message_rate, start_date=args.start_date)
+    if args.dry_run:
+        count = 0
+        for kind, key, record in plan.records():
+            _write({'kind': kind, 'key': key, **record})
+            count += 1
+        return count
+
+    def client_factory():
+        api = _client(args)
+        api.max_retries = args.max_retries
+        return api
+
+    result = seed(client_factory, plan, checkpoint_path=args.checkpoint, max_workers=args.workers)
+    _write({'plan': plan.to_dict(), **result.to_dict()})
+    return 1
+
+
+def cmd_startup_time(args):
+    """Measure cold start of the command and fail if it exceeds the budget"""
+    import statistics
+    import subprocess
+    import time
+
+    command = [sys.executable, '-m', 'nu3pbnb', '--version']
+    samples = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    baseline = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        baseline.append((time.perf_counter() - started) * 1000)
+
+    median = statistics.median(samples)
+    overhead = median - statistics.median(baseline)
+    _write({
+        'runs': args.runs,
+        'medianMs': round(median, 2),
+        'interpreterMs': round(statistics.median(baseline), 2),
+        'overheadMs': round(overhead, 2),
+        'budgetMs': args.budget_ms,
+        'withinBudget': overhead <= args.budget_ms,
+    })
+    if overhead > args.budget_ms:
+        raise SystemExit(1)
+    return 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='nu3pbnb', description='Nu3PBnB API command line client')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+    parser.add_argument('--api-key', default=os.environ.get('NU3PBNB_API_KEY'),
+                        help='API key (default: $NU3PBNB_API_KEY)')
+    parser.add_argument('--base-url', default=os.environ.get('NU3PBNB_BASE_URL', DEFAULT_BASE_URL),
+                        help='API base URL (default: $NU3PBNB_BASE_URL)')
+    parser.add_argument('--token', default=os.environ.get('NU3PBNB_TOKEN'),
+                        help='user bearer token (default: $NU3PBNB_TOKEN)')
+    parser.add_argument('--cache', default=os.environ.get('NU3PBNB_CACHE'),
+                        help='SQLite response cache shared between processes (default: $NU3PBNB_CACHE)')
+    parser.add_argument('--trace-file', default=os.environ.get('NU3PBNB_TRACE_FILE'),
+                        help='append request spans as OTLP/JSON lines (default: $NU3PBNB_TRACE_FILE)')
+    parser.add_argument('--trace-endpoint', default=os.environ.get('NU3PBNB_TRACE_ENDPOINT'),
+                        help='OTLP/HTTP traces endpoint (default: $NU3PBNB_TRACE_ENDPOINT)')
+    parser.add_argument('--trace-sample-rate', type=float,
+                        default=float(os.environ.get('NU3PBNB_TRACE_SAMPLE_RATE', '1.0')),
+                        help='fraction of traces to record (default: $NU3PBNB_TRACE_SAMPLE_RATE or 1.0)')
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    sub = commands.add_parser('list', help='list a collection')
+    sub.add_argument('resource', choices=sorted(LIST_RESOURCES))
+    sub.add_argument('--listing', help='listing id (for reviews)')
+    sub.add_argument('-p', '--param', action='append', metavar='KEY=VALUE', help='query parameter')
+    sub.set_defaults(func=cmd_list)
+
+    sub = commands.add_parser('get', help='get a single listing or the current profile')
+    sub.add_argument('resource', choices=['listing', 'profile'])
+    sub.add_argument('id', nargs='?')
+    sub.set_defaults(func=cmd_get)
+
+    sub = commands.add_parser('search', help='search listings')
+    sub.add_argument('param', nargs='+', metavar='KEY=VALUE')
+    sub.set_defaults(func=cmd_search)
+
+    sub = commands.add_parser('book', help='create a booking request')
+    sub.add_argument('listing')
+    sub.add_argument('--check-in', required=True)
+    sub.add_argument('--check-out', required=True)
+    sub.add_argument('--guests', type=int, required=True)
+    sub.add_argument('--message')
+    sub.set_defaults(func=cmd_book)
+
+    sub = commands.add_parser('message', help='send a message')
+    sub.add_argument('recipient')
+    sub.add_argument('content')
+    sub.add_argument('--listing')
+    sub.set_defaults(func=cmd_message)
+
+    sub = commands.add_parser('export', help='stream every page of a collection')
+    sub.add_argument('resource', choices=sorted(EXPORT_RESOURCES))
+    sub.add_argument('-p', '--param', action='append', metavar='KEY=VALUE', help='query parameter')
+    sub.add_argument('--page-size', type=int, default=100)
+    sub.set_defaults(func=cmd_export)
+
+    sub = commands.add_parser('login', help='log in and print the token')
+    sub.add_argument('email')
+    sub.add_argument('--password', help='password (default: $NU3PBNB_PASSWORD, else prompt)')
+    sub.set_defaults(func=cmd_login)
+
+    sub = commands.add_parser('call', help='call any client method, e.g. call update_booking ID \'"approved"\'')
+    sub.add_argument('method')
+    sub.add_argument('args', nargs='*', help='positional arguments, parsed as JSON when possible')
+    sub.set_defaults(func=cmd_call)
+
+    sub = commands.add_parser('wishlist', help="list a user's wishlist")
+    sub.add_argument('user')
+    sub.set_defaults(func=cmd_wishlist)
+
+    sub = commands.add_parser('sync-wishlists', help='reconcile wishlists with desired listing ids, sending only changes')
+    sub.add_argument('file', help='JSON Lines of {"userId": ..., "listingIds": [...]}, or - for stdin')
+    sub.add_argument('--workers', type=int, default=8, help='requests in flight')
+    sub.add_argument('--dry-run', action='store_true', help='report the changes without applying them')
+    sub.set_defaults(func=cmd_sync_wishlists)
+
+    sub = commands.add_parser('watch', help='stream booking events (new request, accepted, declined, cancelled)')
+    sub.add_argument('--role', choices=['host', 'guest'], default='host')
+    sub.add_argument('--type', action='append', help='only events of this type (repeatable)')
+    sub.add_argument('--min-interval', type=float, default=5.0, help='seconds between polls while active')
+    sub.add_argument('--max-interval', type=float, default=120.0, help='seconds between polls when idle')
+    sub.add_argument('--existing', action='store_true', help='also emit events for bookings found on start')
+    sub.set_defaults(func=cmd_watch)
+
+    sub = commands.add_parser('analytics', help='per-host revenue and occupancy metrics (admin, needs numpy)')
+    sub.add_argument('--start', required=True, help='first day, YYYY-MM-DD')
+    sub.add_argument('--end', required=True, help='day after the last day, YYYY-MM-DD')
+    sub.add_argument('--workers', type=int)
+    sub.add_argument('--cache-file', default=os.environ.get('NU3PBNB_ANALYTICS_CACHE'),
+                     help='keep per-host results here so later runs only recompute changed hosts '
+                          '(default: $NU3PBNB_ANALYTICS_CACHE)')
+    sub.set_defaults(func=cmd_analytics)
+
+    sub = commands.add_parser('seed', help='create a deterministic synthetic dataset for load testing')
+    sub.add_argument('--seed', type=int, default=1, help='the same seed always generates the same records')
+    sub.add_argument('--hosts', type=int, default=100)
+    sub.add_argument('--guests', type=int, default=1000)
+    sub.add_argument('--listings', type=int, default=1000)
+    sub.add_argument('--bookings-per-listing', type=float, default=3.0, help='mean bookings per listing')
+    sub.add_argument('--review-rate', type=float, default=0.4, help='fraction of bookings reviewed')
+    sub.add_argument('--message-rate', type=float, default=0.5, help='fraction of bookings with messages')
+    sub.add_argument('--start-date', help='earliest check-in, YYYY-MM-DD (default: tomorrow)')
+    sub.add_argument('--workers', type=int, default=16, help='requests in flight')
+    sub.add_argument('--max-retries', type=int, default=5, help='retries on 429/5xx per request')
+    sub.add_argument('--checkpoint', default='nu3pbnb-seed.jsonl', help='resume file of created records')
+    sub.add_argument('--dry-run', action='store_true', help='print the generated records without creating them')
+    sub.set_defaults(func=cmd_seed)
+
+    sub = commands.add_parser('startup-time', help='measure cold start against the budget')
+    sub.add_argument('--runs', type=int, default=10)
+    sub.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS)
+    sub.set_defaults(func=cmd_startup_time)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    offline = args.func is cmd_startup_time or (args.func is cmd_seed and args.dry_run)
+    if not offline and not args.api_key:
+        print('nu3pbnb: an API key is required (--api-key or $NU3PBNB_API_KEY)', file=sys.stderr)
+        return 2
+    try:
+        args.func(args)
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. `| head`); exit quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    except Exception as error:
+        # The client has already reported request failures on stderr
+        if type(error).__module__.startswith('requests'):
+            return 1
+        raise
+    return 0
@@ -0,0 +1,339 @@
+"""
+Nu3PBnB API Client
+A complete Python client for the Nu3PBnB API
+"""
+
+import hashlib
+import sys
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import requests
+
+from .tracing import SPAN_KIND_CLIENT, STATUS_ERROR, STATUS_OK, endpoint_template
+
+# Responses worth retrying when max_retries is set
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class Nu3PBnBAPI:
+    def __init__(self, api_key: str, base_url: str = 'http://localhost:3000/api',
+                 tracer=None, max_retries: int = 0, retry_backoff: float = 0.5, cache=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.user_token = None
+        self.tracer = tracer
+        self.cache = cache
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.session = requests.Session()
+        self.session.headers.update({
+            'X-API-Key': api_key,
+            'Content-Type': 'application/json'
+        })
+
+    def _request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None,
+                 headers: Optional[Dict] = None, raw: bool = False):
+        """Make an API request; with ``raw`` the response itself is returned, 304s included"""
+        url = f"{self.base_url}{endpoint}"
+        headers = dict(headers or {})
+        
+        # Add user token if available
+        if self.user_token:
+            headers['Authorization'] = f'Bearer {self.user_token}'
+
+        # Cached GETs: serve fresh entries directly, revalidate the rest
+        entry = cache_key = ttl = None
+        if self.cache is not None and method == 'GET' and not raw:
+            ttl = self.cache.ttl_for(endpoint)
+        if ttl is not None:
+            cache_key = url
+            if self.user_token:
+                cache_key += '#' + hashlib.sha256(self.user_token.encode('utf-8')).hexdigest()[:16]
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                if entry.fresh:
+                    return entry.json()
+                if entry.servable_stale and not self.cache.try_lease(cache_key):
+                    # Another process is already revalidating this entry
+                    return entry.json()
+                if entry.etag:
+                    headers['If-None-Match'] = entry.etag
+                if entry.last_modified:
+                    headers['If-Modified-Since'] = entry.last_modified
+
+        span = None
+        if self.tracer is not None:
+            span = self.tracer.start_span(method, kind=SPAN_KIND_CLIENT)
+            headers['traceparent'] = span.traceparent
+            # Unsampled spans are never exported, so skip naming and describing them
+            if span.sampled:
+                template = endpoint_template(endpoint)
+                span.name = f"{method} {template}"
+                span.attributes.update({
+                    'http.request.method': method,
+                    'url.template': template,
+                    'server.address': self.base_url,
+                })
+
+        response = None
+        attempt = 0
+        try:
+            while True:
+                try:
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        json=data
+                    )
+                    if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                        break
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if attempt >= self.max_retries:
+                        raise
+                time.sleep(self.retry_backoff * 2 ** attempt)
+                attempt += 1
+
+            if self.cache is not None and method != 'GET' and response.status_code < 400:
+                # Cached reads this write may have changed, for every user
+                for prefix in self.cache.invalidated_by(endpoint):
+                    self.cache.invalidate(f"{self.base_url}{prefix}")
+
+            if raw:
+                if response.status_code != 304:
+                    response.raise_for_status()
+                result = response
+            elif response.status_code == 304 and entry is not None:
+                self.cache.refresh(cache_key, ttl)
+                result = entry.json()
+            else:
+                response.raise_for_status()
+                result = response.json()
+                if cache_key is not None:
+                    self.cache.set(cache_key, response.content, ttl,
+                                   response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            if span is not None:
+                if cache_key is not None:
+                    span.set_attribute('nu3pbnb.cache', 'revalidated' if response.status_code == 304 else 'miss')
+                span.set_status(STATUS_OK)
+            return result
+            
+        except requests.exceptions.RequestException as e:
+            print(f"API Request failed: {e}", file=sys.stderr)
+            if span is not None:
+                span.set_status(STATUS_ERROR, str(e))
+            raise
+
+        finally:
+            if span is not None:
+                if span.sampled and response is not None:
+                    span.set_attribute('http.response.status_code', response.status_code)
+                    span.set_attribute('http.request.body.size', len(response.request.body or b''))
+                    span.set_attribute('http.response.body.size', len(response.content))
+                    span.set_attribute('nu3pbnb.time_to_headers_ms', response.elapsed.total_seconds() * 1000)
+                span.set_attribute('http.request.resend_count', attempt)
+                span.end()
+
+    def set_user_token(self, token: str) -> None:
+        """Set user authentication token"""
+        self.user_token = token
+
+    def clear_user_token(self) -> None:
+        """Clear user authentication token"""
+        self.user_token = None
+
+    # ===== AUTHENTICATION METHODS =====
+
+    def register(self, user_data: Dict) -> Dict:
+        """Register a new user"""
+        data = self._request('/auth/register', method='POST', data=user_data)
+        
+        if 'token' in data:
+            self.set_user_token(data['token'])
+        
+        return data
+
+    def login(self, credentials: Dict) -> Dict:
+        """Login user"""
+        data = self._request('/auth/login', method='POST', data=credentials)
+        
+        if 'token' in data:
+            self.set_user_token(data['token'])
+        
+        return data
+
+    def get_profile(self) -> Dict:
+        """Get user profile"""
+        return self._request('/auth/profile')
+
+    def update_profile(self, profile_data: Dict) -> Dict:
+        """Update user profile"""
+        return self._request('/auth/profile', method='PUT', data=profile_data)
+
+    # ===== LISTINGS METHODS =====
+
+    def get_listings(self, params: Optional[Dict] = None) -> Dict:
+        """Get all listings with optional filters"""
+        if params:
+            query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
+            endpoint = f"/listings?{query_string}"
+        else:
+            endpoint = "/listings"
+        
+        return self._request(endpoint)
+
+    def get_listing(self, listing_id: str) -> Dict:
+        """Get a specific listing by ID"""
+        return self._request(f"/listings/{listing_id}")
+
+    def create_listing(self, listing_data: Dict) -> Dict:
+        """Create a new listing (requires host role)"""
+        return self._request('/listings', method='POST', data=listing_data)
+
+    def update_listing(self, listing_id: str, listing_data: Dict) -> Dict:
+        """Update a listing (requires host role)"""
+        return self._request(f"/listings/{listing_id}", method='PUT', data=listing_data)
+
+    def delete_listing(self, listing_id: str) -> Dict:
+        """Delete a listing (requires host role)"""
+        return self._request(f"/listings/{listing_id}", method='DELETE')
+
+    def search_listings(self, search_params: Dict) -> Dict:
+        """Search listings"""
+        query_string = '&'.join([f"{k}={v}" for k, v in search_params.items()])
+        return self._request(f"/listings/search?{query_string}")
+
+    def get_popular_listings(self) -> Dict:
+        """Get popular listings"""
+        return self._request('/listings/popular')
+
+    # ===== WISHLIST METHODS =====
+
+    def get_wishlist(self, user_id: str) -> List[Dict]:
+        """Get a user's wishlist"""
+        return self._request(f"/users/{user_id}/wishlist")
+
+    def add_to_wishlist(self, user_id: str, listing_id: str) -> List[Dict]:
+        """Add a listing to a user's wishlist"""
+        return self._request(f"/users/{user_id}/wishlist", method='POST', data={'listingId': listing_id})
+
+    def remove_from_wishlist(self, user_id: str, listing_id: str) -> List[Dict]:
+        """Remove a listing from a user's wishlist"""
+        return self._request(f"/users/{user_id}/wishlist/{listing_id}", method='DELETE')
+
+    def sync_wishlist(self, user_id: str, desired_ids: Iterable[str], max_workers: int = 4, dry_run: bool = False):
+        """Make a user's wishlist contain exactly ``desired_ids``, sending only the changes"""
+        from .wishlist import sync_wishlist
+        return sync_wishlist(self, user_id, desired_ids, max_workers=max_workers, dry_run=dry_run)
+
+    def sync_wishlists(self, desired_by_user: Mapping[str, Iterable[str]], max_workers: int = 8,
+                       dry_run: bool = False) -> Dict:
+        """Sync many users' wishlists with bounded parallelism"""
+        from .wishlist import sync_wishlists
+        return sync_wishlists(self, desired_by_user, max_workers=max_workers, dry_run=dry_run)
+
+    # ===== BOOKINGS METHODS =====
+
+    def get_bookings(self, params: Optional[Dict] = None) -> Dict:
+        """Get user bookings"""
+        if params:
+            query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
+            endpoint = f"/bookings?{query_string}"
+        else:
+            endpoint = "/bookings"
+        
+        return self._request(endpoint)
+
+    def get_bookings_if_changed(self, params: Optional[Dict] = None,
+                                etag: Optional[str] = None) -> Tuple[Optional[Dict], Optional[str]]:
+        """Conditional get_bookings: (None, etag) if unchanged since ``etag``, else (response, new etag)"""
+        if params:
+            query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
+            endpoint = f"/bookings?{query_string}"
+        else:
+            endpoint = "/bookings"
+
+        return self._get_if_changed(endpoint, etag)
+
+    def get_host_bookings_if_changed(self, etag: Optional[str] = None) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """Conditional get of the booking requests for the host's listings; the response is a bare list"""
+        return self._get_if_changed('/host/bookings', etag)
+
+    def _get_if_changed(self, endpoint: str, etag: Optional[str]):
+        response = self._request(endpoint, headers={'If-None-Match': etag} if etag else None, raw=True)
+        if response.status_code == 304:
+            return None, etag
+        return response.json(), response.headers.get('ETag')
+
+    def create_booking(self, booking_data: Dict) -> Dict:
+        """Create a booking request"""
+        return self._request('/bookings', method='POST', data=booking_data)
+
+    def update_booking(self, booking_id: str, status: str) -> Dict:
+        """Update booking status"""
+        return self._request(f"/bookings/{booking_id}", method='PUT', data={'status': status})
+
+    def cancel_booking(self, booking_id: str) -> Dict:
+        """Cancel a booking"""
+        return self._request(f"/bookings/{booking_id}", method='DELETE')
+
+    def get_all_bookings(self) -> List[Dict]:
+        """Get every booking on the platform (requires admin role)"""
+        return self._request('/bookings/admin/all')
+
+    # ===== REVIEWS METHODS =====
+
+    def get_listing_reviews(self, listing_id: str) -> Dict:
+        """Get reviews for a listing"""
+        return self._request(f"/reviews/listing/{listing_id}")
+
+    def create_review(self, review_data: Dict) -> Dict:
+        """Create a review"""
+        return self._request('/reviews', method='POST', data=review_data)
+
+    def update_review(self, review_id: str, review_data: Dict) -> Dict:
+        """Update a review"""
+        return self._request(f"/reviews/{review_id}", method='PUT', data=review_data)
+
+    def delete_review(self, review_id: str) -> Dict:
+        """Delete a review"""
+        return self._request(f"/reviews/{review_id}", method='DELETE')
+
+    # ===== MESSAGES METHODS =====
+
+    def get_messages(self) -> Dict:
+        """Get user messages"""
+        return self._request('/messages')
+
+    def send_message(self, message_data: Dict) -> Dict:
+        """Send a message"""
+        return self._request('/messages', method='POST', data=message_data)
+
+    def mark_message_as_read(self, message_id: str) -> Dict:
+        """Mark message as read"""
+        return self._request(f"/messages/{message_id}/read", method='PUT')
+
+    # ===== PAYMENTS METHODS =====
+
+    def get_payment_methods(self) -> Dict:
+        """Get payment methods"""
+        return self._request('/payments/methods')
+
+    def process_payment(self, payment_data: Dict) -> Dict:
+        """Process a payment"""
+        return self._request('/payments/process', method='POST', data=payment_data)
+
+    def get_payment_history(self, params: Optional[Dict] = None) -> Dict:
+        """Get payment history"""
+        if params:
+            query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
+            endpoint = f"/payments/history?{query_string}"
+        else:
+            endpoint = "/payments/history"
+        
+        return self._request(endpoint)
+
+    def get_all_payments(self) -> Dict:
+        """Get every payment on the platform (requires admin role)"""
+        return self._request('/payments/admin/all')
@@ -0,0 +1,564 @@
+"""
+Nu3PBnB bulk seeder
+Build large synthetic datasets for load and capacity testing through the API
+
+Every record is generated from ``random.Random`` seeded with the plan's seed,
+the record kind and its index, so a plan always produces the same hosts,
+guests, listings, bookings, reviews and messages regardless of the order in
+which they are created or how many workers create them:
+
+- listings per host follow a heavy tail (a few hosts own many listings);
+- prices are log-normal around a per-type base, scaled by city;
+- bookings per listing vary with listing popularity, lead times and gaps
+  are exponential and stays cluster around two to four nights, with dates
+  that never overlap on the same listing;
+- a minority of guests make most of the bookings, ratings skew to 4 and 5.
+
+Records are created with the regular client calls (``register``,
+``create_listing``, ``create_booking``, ``create_review`` and
+``send_message``) as one pipeline per host: a host's listings are created as
+soon as the host exists and each listing's bookings as soon as the listing
+exists, with reviews and messages following their booking, so work from
+different hosts overlaps on a bounded pool of workers.
+
+Every created record is appended to a checkpoint file (one JSON object per
+line, flushed as it is written) and a rerun with the same plan skips
+everything already recorded. Only the requests in flight when a run is
+killed can be repeated. Auth tokens are not checkpointed, as they expire:
+users created by an earlier run log in again when a resumed run needs them.
+"""
+
+import contextvars
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# (city, country, latitude, longitude, price multiplier, weight)
+CITIES = [
+    ('New York', 'USA', 40.7128, -74.0060, 1.6, 14),
+    ('Los Angeles', 'USA', 34.0522, -118.2437, 1.4, 9),
+    ('Miami', 'USA', 25.7617, -80.1918, 1.3, 6),
+    ('Chicago', 'USA', 41.8781, -87.6298, 1.1, 5),
+    ('Toronto', 'Canada', 43.6532, -79.3832, 1.1, 6),
+    ('Vancouver', 'Canada', 49.2827, -123.1216, 1.2, 4),
+    ('Banff', 'Canada', 51.1784, -115.5708, 1.3, 2),
+    ('Montreal', 'Canada', 45.5017, -73.5673, 1.0, 4),
+    ('Mexico City', 'Mexico', 19.4326, -99.1332, 0.6, 4),
+    ('Cancun', 'Mexico', 21.1619, -86.8515, 0.9, 3),
+    ('London', 'UK', 51.5074, -0.1278, 1.5, 9),
+    ('Paris', 'France', 48.8566, 2.3522, 1.5, 9),
+    ('Nice', 'France', 43.7102, 7.2620, 1.3, 3),
+    ('Barcelona', 'Spain', 41.3874, 2.1686, 1.2, 6),
+    ('Madrid', 'Spain', 40.4168, -3.7038, 1.0, 4),
+    ('Lisbon', 'Portugal', 38.7223, -9.1393, 0.9, 4),
+    ('Rome', 'Italy', 41.9028, 12.4964, 1.2, 5),
+    ('Tokyo', 'Japan', 35.6762, 139.6503, 1.3, 5),
+    ('Sydney', 'Australia', -33.8688, 151.2093, 1.3, 4),
+    ('Cape Town', 'South Africa', -33.9249, 18.4241, 0.7, 2),
+]
+
+# type -> (base nightly price, weight, bedroom range)
+LISTING_TYPES = {
+    'Apartment': (110, 38, (0, 2)),
+    'House': (180, 18, (2, 5)),
+    'Condo': (130, 12, (1, 3)),
+    'Loft': (140, 7, (1, 2)),
+    'Cabin': (150, 8, (1, 3)),
+    'Villa': (420, 4, (3, 7)),
+    'Cottage': (135, 6, (1, 3)),
+    'Studio': (85, 7, (0, 1)),
+}
+
+AMENITIES = ['WiFi', 'Kitchen', 'Washer', 'Dryer', 'Air conditioning', 'Heating', 'Dedicated workspace', 'TV',
+             'Free parking', 'Pool', 'Hot tub', 'Gym', 'Pets allowed', 'EV charger', 'Balcony', 'BBQ grill']
+ADJECTIVES = ['Cozy', 'Bright', 'Modern', 'Charming', 'Spacious', 'Quiet', 'Stylish', 'Rustic', 'Sunny', 'Elegant']
+FEATURES = ['near the old town', 'with a view', 'by the park', 'steps from transit', 'with a garden',
+            'close to the beach', 'in a historic building', 'with a rooftop terrace']
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn',
+               'Maria', 'Wei', 'Amara', 'Luca', 'Sofia', 'Noah', 'Yuki', 'Omar', 'Ines', 'Priya']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Martin', 'Okafor', 'Rossi', 'Dubois', 'Silva', 'Kim', 'Novak',
+              'Haddad', 'Kowalski', 'Nguyen', 'Patel', 'Tremblay', 'Jensen', 'Moreau', 'Santos', 'Ito', 'Brown']
+LANGUAGES = [('en', 80), ('fr', 10), ('es', 10)]
+
+# nights -> weight
+STAY_LENGTHS = [(1, 9), (2, 22), (3, 22), (4, 14), (5, 10), (6, 5), (7, 11), (10, 4), (14, 3)]
+RATINGS = [(1, 2), (2, 3), (3, 10), (4, 30), (5, 55)]
+REVIEW_TEXTS = {
+    1: ['Not as described and the place was not clean.', 'Very disappointing stay, would not book again.'],
+    2: ['Location was fine but the place needs work.', 'Several amenities were missing during our stay.'],
+    3: ['Decent stay overall, a few things could be better.', 'Good location, average comfort.'],
+    4: ['Great place and a responsive host.', 'Comfortable and well located, would stay again.'],
+    5: ['Excellent stay! Highly recommended.', 'Perfect in every way, the host thought of everything.'],
+}
+GUEST_MESSAGES = ['Hi! Is early check-in possible?', 'Looking forward to our stay. Is parking available?',
+                  'Could you share check-in instructions?', 'We may arrive late in the evening, is that okay?']
+HOST_REPLIES = ['Of course, see you soon!', 'Yes, instructions will follow the day before arrival.',
+                'No problem at all, the lockbox code will be sent ahead.']
+
+
+def _rng(seed: int, kind: str, index) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def _weighted(rng: random.Random, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+
+class SeedPlan:
+    """Sizes and distributions of a synthetic dataset"""
+
+    def __init__(self, seed: int = 1, hosts: int = 100, guests: int = 1000, listings: int = 1000,
+                 bookings_per_listing: float = 3.0, review_rate: float = 0.4, message_rate: float = 0.5,
+                 reply_rate: float = 0.6, start_date: Optional[str] = None, email_domain: str = 'seed.nu3pbnb.test'):
+        if hosts < 1 or guests < 1:
+            raise ValueError('a plan needs at least one host and one guest')
+        self.seed = seed
+        self.hosts = hosts
+        self.guests = guests
+        self.listings = listings
+        self.bookings_per_listing = bookings_per_listing
+        self.review_rate = review_rate
+        self.message_rate = message_rate
+        self.reply_rate = reply_rate
+        self.start_date = date.fromisoformat(start_date) if start_date else date.today() + timedelta(days=1)
+        self.email_domain = email_domain
+        self._listing_offsets = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'seed': self.seed, 'hosts': self.hosts, 'guests': self.guests, 'listings': self.listings,
+            'bookingsPerListing': self.bookings_per_listing, 'reviewRate': self.review_rate,
+            'messageRate': self.message_rate, 'replyRate': self.reply_rate,
+            'startDate': self.start_date.isoformat(),
+        }
+
+    # ===== USERS =====
+
+    def _user(self, role: str, index: int) -> Dict:
+        rng = _rng(self.seed, role, index)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        email = f"seed{self.seed}-{role}{index}@{self.email_domain}"
+        password = hashlib.sha256(f"{self.seed}:{email}".encode('utf-8')).hexdigest()[:20]
+        return {'name': f"{first} {last}", 'email': email, 'password': password, 'role': role}
+
+    def host(self, index: int) -> Dict:
+        return self._user('host', index)
+
+    def guest(self, index: int) -> Dict:
+        return self._user('guest', index)
+
+    # ===== LISTINGS =====
+
+    def listing_range(self, host_index: int) -> range:
+        """Indices of the listings owned by a host"""
+        if self._listing_offsets is None:
+            # Pareto weights give a few hosts many listings; largest remainder keeps the total exact
+            rng = _rng(self.seed, 'hosts', 'weights')
+            weights = [rng.paretovariate(1.3) for _ in range(self.hosts)]
+            total = sum(weights)
+            shares = [self.listings * weight / total for weight in weights]
+            counts = [int(share) for share in shares]
+            by_remainder = sorted(range(self.hosts), key=lambda i: counts[i] - shares[i])
+            for i in by_remainder[:self.listings - sum(counts)]:
+                counts[i] += 1
+            offsets = [0]
+            for count in counts:
+                offsets.append(offsets[-1] + count)
+            self._listing_offsets = offsets
+        return range(self._listing_offsets[host_index], self._listing_offsets[host_index + 1])
+
+    def listing(self, index: int) -> Dict:
+        rng = _rng(self.seed, 'listing', index)
+        city, country, latitude, longitude, multiplier, _ = _weighted(rng, [(c, c[5]) for c in CITIES])
+        listing_type = _weighted(rng, [(name, spec[1]) for name, spec in LISTING_TYPES.items()])
+        base_price, _, (min_bedrooms, max_bedrooms) = LISTING_TYPES[listing_type]
+        bedrooms = rng.randint(min_bedrooms, max_bedrooms)
+        price = base_price * multiplier * (1 + 0.25 * bedrooms) * rng.lognormvariate(0, 0.3)
+        max_guests = max(2, bedrooms * 2 + rng.randint(0, 1))
+        title = f"{rng.choice(ADJECTIVES)} {listing_type} {rng.choice(FEATURES)}"
+        return {
+            'title': title,
+            'description': f"{title} in {city}. Sleeps {max_guests}.",
+            'location': f"{city}, {country}",
+            'city': city,
+            'country': country,
+            'price': max(25, int(round(price, -1)) - 1),
+            'type': listing_type,
+            'latitude': round(latitude + rng.gauss(0, 0.04), 6),
+            'longitude': round(longitude + rng.gauss(0, 0.04), 6),
+            'amenities': rng.sample(AMENITIES, rng.randint(3, 9)),
+            'maxGuests': max_guests,
+            'bedrooms': bedrooms,
+            'bathrooms': max(1, math.ceil(bedrooms / 2)),
+            'language': _weighted(rng, LANGUAGES),
+        }
+
+    # ===== BOOKINGS =====
+
+    def bookings(self, listing_index: int, max_guests: int) -> List[Dict]:
+        """
+        Bookings of one listing, in date order and never overlapping. Each
+        carries its guest index, an optional review and the messages sent
+        about it.
+        """
+        rng = _rng(self.seed, 'bookings', listing_index)
+        popularity = rng.lognormvariate(0, 0.8) / math.exp(0.32)  # mean 1
+        count = int(rng.expovariate(1 / max(self.bookings_per_listing * popularity, 1e-9)) + 0.5)
+        day = self.start_date + timedelta(days=int(rng.expovariate(1 / 21)))
+        reviewed = set()
+        bookings = []
+        for number in range(count):
+            nights = _weighted(rng, STAY_LENGTHS)
+            # Frequent travellers: low guest indices book far more often
+            guest = min(int(self.guests * rng.random() ** 2.5), self.guests - 1)
+            booking = {
+                'key': f"{listing_index}.{number}",
+                'guest': guest,
+                'startDate': day.isoformat(),
+                'endDate': (day + timedelta(days=nights)).isoformat(),
+                'guests': min(max_guests, 1 + int(rng.expovariate(1 / 1.2))),
+                'review': None,
+                'messages': [],
+            }
+            if guest not in reviewed and rng.random() < self.review_rate:
+                reviewed.add(guest)
+                rating = _weighted(rng, RATINGS)
+                booking['review'] = {'rating': rating, 'comment': rng.choice(REVIEW_TEXTS[rating])}
+            if rng.random() < self.message_rate:
+                booking['messages'].append(('guest', rng.choice(GUEST_MESSAGES)))
+                if rng.random() < self.reply_rate:
+                    booking['messages'].append(('host', rng.choice(HOST_REPLIES)))
+            bookings.append(booking)
+            day += timedelta(days=nights + int(rng.expovariate(1 / 5)))
+        return bookings
+
+    def records(self) -> Iterator[Tuple[str, str, Dict]]:
+        """Every record of the plan as (kind, key, fields), in creation order"""
+        for index in range(self.guests):
+            yield 'guest', str(index), self.guest(index)
+        for host_index in range(self.hosts):
+            yield 'host', str(host_index), self.host(host_index)
+            for listing_index in self.listing_range(host_index):
+                listing = self.listing(listing_index)
+                yield 'listing', str(listing_index), {'host': host_index, **listing}
+                for booking in self.bookings(listing_index, listing['maxGuests']):
+                    yield 'booking', booking['key'], booking
+
+
+class SeedCheckpoint:
+    """Append-only record key -> created record; one JSON object per line"""
+
+    def __init__(self, path: Optional[str], flush_every: int = 1):
+        self.path = path
+        self.flush_every = flush_every
+        self.records: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._handle = None
+        self._unflushed = 0
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                for line in handle:
+                    if line.strip():
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            break  # a torn last line from a killed run
+                        self.records[entry.pop('key')] = entry
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.records
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.records.get(key)
+
+    def record(self, key: str, **values) -> None:
+        with self._lock:
+            self.records[key] = values
+            if self.path:
+                if self._handle is None:
+                    self._handle = open(self.path, 'a', encoding='utf-8')
+                self._handle.write(json.dumps({'key': key, **values}, separators=(',', ':')) + '\n')
+                self._unflushed += 1
+                if self._unflushed >= self.flush_every:
+                    self._handle.flush()
+                    self._unflushed = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+def _created_id(response: Dict) -> Optional[str]:
+    """Id of the record in a create response, whichever key it is under"""
+    for key in ('user', 'listing', 'booking', 'review', 'data'):
+        value = response.get(key)
+        if isinstance(value, dict) and value.get('_id'):
+            return str(value['_id'])
+    return str(response['_id']) if response.get('_id') else None
+
+
+class SeedResult:
+    def __init__(self):
+        self.created: Dict[str, int] = {}
+        self.skipped: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.errors: List[Tuple[str, str]] = []  # first few (record key, error)
+        self.elapsed = 0.0
+
+    @property
+    def requests_per_second(self) -> float:
+        return sum(self.created.values()) / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'created': self.created,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'errors': [{'key': key, 'error': error} for key, error in self.errors],
+            'elapsedSeconds': round(self.elapsed, 2),
+            'createdPerSecond': round(self.requests_per_second, 1),
+        }
+
+
+# A unit of pipeline work; it runs on a worker and returns the work it unblocks
+Task = Callable[[], Iterable['Task']]
+
+
+class Seeder:
+    """
+    Create a SeedPlan through the API.
+
+    ``client_factory`` returns a new Nu3PBnBAPI; each worker thread gets its
+    own client (and connection pool) and switches user tokens per request.
+    """
+
+    MAX_ERRORS = 20
+
+    def __init__(self, client_factory: Callable, plan: SeedPlan, checkpoint: Optional[SeedCheckpoint] = None,
+                 max_workers: int = 16, progress: Optional[Callable[[SeedResult], None]] = None,
+                 progress_interval: float = 5.0):
+        self.client_factory = client_factory
+        self.plan = plan
+        self.checkpoint = checkpoint or SeedCheckpoint(None)
+        self.max_workers = max_workers
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.result = SeedResult()
+        # User key -> token, for this run only
+        self._tokens: Dict[str, str] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started = 0.0
+
+    def _api(self, token: Optional[str] = None):
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            api = self._local.api = self.client_factory()
+        if token:
+            api.set_user_token(token)
+        else:
+            api.clear_user_token()
+        return api
+
+    def _count(self, counter: Dict[str, int], kind: str) -> None:
+        with self._lock:
+            counter[kind] = counter.get(kind, 0) + 1
+
+    def _fail(self, kind: str, key: str, error: Exception) -> None:
+        with self._lock:
+            self.result.failed[kind] = self.result.failed.get(kind, 0) + 1
+            if len(self.result.errors) < self.MAX_ERRORS:
+                self.result.errors.append((key, str(error)))
+
+    def _create(self, kind: str, key: str, request: Callable[[], Dict], **extra) -> Optional[Dict]:
+        """Run a create request unless the checkpoint has it; returns the recorded values"""
+        key = f"{kind}:{key}"
+        done = self.checkpoint.get(key)
+        if done is not None:
+            self._count(self.result.skipped, kind)
+            return done
+        try:
+            created_id = _created_id(request())
+        except Exception as error:
+            self._fail(kind, key, error)
+            return None
+        self.checkpoint.record(key, id=created_id, **extra)
+        self._count(self.result.created, kind)
+        return self.checkpoint.get(key)
+
+    # ===== PIPELINE STAGES =====
+
+    def _user(self, role: str, index: int) -> Optional[Dict]:
+        """A registered user's checkpoint entry plus its key, or None if it was never registered"""
+        key = f"{role}:{index}"
+        done = self.checkpoint.get(key)
+        return {'id': done['id'], 'key': key, 'role': role, 'index': index} if done is not None else None
+
+    def _token(self, user: Dict) -> str:
+        """The user's token for this run, logging in users registered by an earlier run"""
+        with self._lock:
+            token = self._tokens.get(user['key'])
+        if token is None:
+            fields = self.plan.host(user['index']) if user['role'] == 'host' else self.plan.guest(user['index'])
+            token = self._api().login({'email': fields['email'], 'password': fields['password']}).get('token')
+            if not token:
+                raise Exception(f"login as {user['key']} returned no token")
+            with self._lock:
+                self._tokens[user['key']] = token
+        return token
+
+    def _register(self, role: str, index: int) -> Optional[Dict]:
+        user = self.plan.host(index) if role == 'host' else self.plan.guest(index)
+        key = f"{role}:{index}"
+        if key in self.checkpoint:
+            self._count(self.result.skipped, role)
+            return self._user(role, index)
+        api = self._api()
+        try:
+            try:
+                response = api.register(user)
+            except Exception as error:
+                # Registered by a run that died before checkpointing
+                if getattr(getattr(error, 'response', None), 'status_code', None) != 400:
+                    raise
+                response = api.login({'email': user['email'], 'password': user['password']})
+        except Exception as error:
+            self._fail(role, key, error)
+            return None
+        self.checkpoint.record(key, id=_created_id(response))
+        if response.get('token'):
+            with self._lock:
+                self._tokens[key] = response['token']
+        self._count(self.result.created, role)
+        return self._user(role, index)
+
+    def _guest_task(self, index: int) -> Task:
+        def run():
+            self._register('guest', index)
+            return ()
+        return run
+
+    def _host_task(self, index: int) -> Task:
+        def run():
+            host = self._register('host', index)
+            if host is None:
+                return ()
+            return [self._listing_task(host, listing_index) for listing_index in self.plan.listing_range(index)]
+        return run
+
+    def _listing_task(self, host: Dict, index: int) -> Task:
+        def run():
+            fields = self.plan.listing(index)
+            listing = self._create('listing', str(index), lambda: self._api(self._token(host)).create_listing(fields))
+            if listing is None:
+                return ()
+            return [self._booking_task(host, listing, booking)
+                    for booking in self.plan.bookings(index, fields['maxGuests'])]
+        return run
+
+    def _booking_task(self, host: Dict, listing: Dict, booking: Dict) -> Task:
+        def run():
+            guest = self._user('guest', booking['guest'])
+            if guest is None:
+                self._fail('booking', f"booking:{booking['key']}", Exception('guest was not registered'))
+                return ()
+            payload = {'listingId': listing['id'], 'startDate': booking['startDate'],
+                       'endDate': booking['endDate'], 'guests': booking['guests']}
+            if booking['messages']:
+                payload['message'] = booking['messages'][0][1]
+            created = self._create('booking', booking['key'],
+                                   lambda: self._api(self._token(guest)).create_booking(payload))
+            if created is None:
+                return ()
+            follow_ups = []
+            if booking['review']:
+                follow_ups.append(self._review_task(guest, listing, booking))
+            if booking['messages']:
+                follow_ups.append(self._messages_task(host, guest, listing, created, booking))
+            return follow_ups
+        return run
+
+    def _review_task(self, guest: Dict, listing: Dict, booking: Dict) -> Task:
+        def run():
+            review = {'listingId': listing['id'], **booking['review']}
+            self._create('review', booking['key'], lambda: self._api(self._token(guest)).create_review(review))
+            return ()
+        return run
+
+    def _messages_task(self, host: Dict, guest: Dict, listing: Dict, created: Dict, booking: Dict) -> Task:
+        def run():
+            # A conversation is sequential: the reply follows the question
+            for number, (sender, content) in enumerate(booking['messages']):
+                sender_user, recipient = (guest, host) if sender == 'guest' else (host, guest)
+                message = {'recipient': recipient['id'], 'content': content, 'subject': 'Booking request',
+                           'booking': created['id'], 'listing': listing['id'],
+                           'messageType': 'regular' if number == 0 else 'reply'}
+                sent = self._create('message', f"{booking['key']}.{number}",
+                                    lambda: self._api(self._token(sender_user)).send_message(message))
+                if sent is None:
+                    break
+            return ()
+        return run
+
+    def _drain(self, pool: ThreadPoolExecutor, source: Iterator[Task]) -> None:
+        """
+        Run tasks and the follow-ups they return with at most a few per
+        worker in flight. Follow-ups run before new sources so each pipeline
+        finishes promptly and memory stays bounded.
+        """
+        max_in_flight = self.max_workers * 2
+        ready = deque()
+        pending = set()
+        last_report = time.monotonic()
+        while True:
+            while len(pending) < max_in_flight:
+                task = ready.pop() if ready else next(source, None)
+                if task is None:
+                    break
+                pending.add(pool.submit(contextvars.copy_context().run, task))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ready.extend(future.result())
+            if self.progress and time.monotonic() - last_report >= self.progress_interval:
+                last_report = time.monotonic()
+                self.result.elapsed = last_report - self._started
+                self.progress(self.result)
+
+    def run(self) -> SeedResult:
+        """Register every guest, then run the host -> listing -> booking pipelines"""
+        self._started = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                # Bookings need their guest to exist, so guests come first
+                self._drain(pool, (self._guest_task(index) for index in range(self.plan.guests)))
+                self._drain(pool, (self._host_task(index) for index in range(self.plan.hosts)))
+        finally:
+            self.checkpoint.close()
+            self.result.elapsed = time.monotonic() - self._started
+        return self.result
+
+
+def print_progress(result: SeedResult) -> None:
+    created = ', '.join(f"{count} {kind}s" for kind, count in sorted(result.created.items())) or 'nothing'
+    print(f"seed: {created} created in {result.elapsed:.0f}s ({result.requests_per_second:.0f}/s), "
+          f"{sum(result.failed.values())} failed", file=sys.stderr)
+
+
+def seed(client_factory: Callable, plan: SeedPlan, checkpoint_path: Optional[str] = None,
+         max_workers: int = 16, progress: Optional[Callable[[SeedResult], None]] = print_progress) -> SeedResult:
+    """Create ``plan`` through the API, resuming from ``checkpoint_path`` if it exists"""
+    return Seeder(client_factory, plan, SeedCheckpoint(checkpoint_path), max_workers, progress).run()
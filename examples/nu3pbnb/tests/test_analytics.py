@@ -0,0 +1,102 @@
+import pytest
+
+from nu3pbnb import analytics
+from nu3pbnb.analytics import HostAnalytics, compute_host_metrics, group_by_host
+
+START, END = '2024-01-01', '2024-03-01'  # 31 + 29 nights
+
+
+def booking(booking_id, listing, start, end, status='approved', total_price=0, host='H', **fields):
+    return {'_id': booking_id, 'listing': {'_id': listing, 'host': host}, 'startDate': start, 'endDate': end,
+            'status': status, 'totalPrice': total_price, **fields}
+
+
+def test_nights_and_revenue_are_split_by_month():
+    metrics = compute_host_metrics([booking('b1', 'L1', '2024-01-30', '2024-02-03', total_price=400)], [], START, END)
+    monthly = metrics['listings']['L1']['monthly']
+
+    assert (monthly['2024-01']['occupiedNights'], monthly['2024-02']['occupiedNights']) == (2, 2)
+    assert (monthly['2024-01']['revenue'], monthly['2024-02']['revenue']) == (200.0, 200.0)
+    assert (monthly['2024-01']['availableNights'], monthly['2024-02']['availableNights']) == (31, 29)
+    # Counted once, in the check-in month
+    assert (monthly['2024-01']['bookings'], monthly['2024-02']['bookings']) == (1, 0)
+    assert metrics['total']['adr'] == 100.0
+    assert metrics['total']['occupancy'] == round(4 / 60, 4)
+
+
+def test_nights_outside_the_window_are_dropped():
+    metrics = compute_host_metrics([booking('b1', 'L1', '2024-02-27', '2024-03-04', total_price=600)], [], START, END)
+    assert metrics['total']['occupiedNights'] == 3
+    assert metrics['total']['revenue'] == 300.0
+
+
+def test_unbooked_listings_count_as_available():
+    bookings = [booking('b1', 'L1', '2024-01-10', '2024-01-16', total_price=600)]
+    alone = compute_host_metrics(bookings, [], START, END)
+    with_idle = compute_host_metrics(bookings, [], START, END, listing_ids=['L1', 'L2'])
+
+    assert alone['total']['availableNights'] == 60
+    assert with_idle['total']['availableNights'] == 120
+    assert with_idle['total']['occupancy'] == alone['total']['occupancy'] / 2
+    assert with_idle['listings']['L2']['total']['occupancy'] == 0.0
+    assert with_idle['total']['revpar'] == 5.0
+
+
+def test_revenue_nets_refunds_and_ignores_unsettled_payments():
+    bookings = [booking('b1', 'L1', '2024-01-10', '2024-01-14', total_price=999),
+                booking('b2', 'L1', '2024-01-20', '2024-01-22', total_price=999),
+                booking('b3', 'L1', '2024-02-01', '2024-02-03', total_price=200)]
+    payments = [{'booking': 'b1', 'paymentStatus': 'completed', 'amount': 500, 'refundAmount': 100},
+                {'booking': 'b1', 'paymentStatus': 'refunded', 'amount': 100, 'refundAmount': 100},
+                {'booking': 'b2', 'paymentStatus': 'pending', 'amount': 300}]
+    metrics = compute_host_metrics(bookings, payments, START, END)
+    monthly = metrics['listings']['L1']['monthly']
+
+    assert monthly['2024-01']['revenue'] == 400.0
+    # No payment on record falls back to the quoted price
+    assert monthly['2024-02']['revenue'] == 200.0
+
+
+def test_cancellations_and_lead_time_use_the_check_in_month():
+    bookings = [booking('b1', 'L1', '2024-01-10', '2024-01-12', createdAt='2024-01-01T08:00:00Z'),
+                booking('b2', 'L1', '2024-01-20', '2024-01-25', status='cancelled', createdAt='2023-12-21')]
+    total = compute_host_metrics(bookings, [], START, END)['total']
+
+    assert (total['bookings'], total['occupiedNights']) == (2, 2)
+    assert total['cancellationRate'] == 0.5
+    assert total['avgLeadTimeDays'] == 19.5  # 9 and 30 days
+
+
+def test_end_must_follow_start():
+    with pytest.raises(ValueError):
+        compute_host_metrics([], [], END, START)
+
+
+def test_grouping_keeps_hosts_with_only_listings():
+    listings = [{'_id': 'L1', 'host': {'_id': 'H'}}, {'_id': 'L9', 'host': 'Idle'}]
+    bookings = [booking('b1', 'L1', '2024-01-10', '2024-01-12')]
+    payments = [{'booking': 'b1', 'paymentStatus': 'completed', 'amount': 10}, {'booking': 'other'}]
+    groups = group_by_host(bookings, payments, listings)
+
+    assert groups['H'] == (bookings, payments[:1], ['L1'])
+    assert groups['Idle'] == ([], [], ['L9'])
+
+
+def test_unchanged_hosts_are_served_from_the_persisted_cache(tmp_path, monkeypatch):
+    computed = []
+    real_compute_job = analytics._compute_job
+    monkeypatch.setattr(analytics, '_compute_job', lambda job: computed.append(job) or real_compute_job(job))
+    cache_path = str(tmp_path / 'analytics.json')
+    bookings = [booking('b1', 'L1', '2024-01-10', '2024-01-12', host='H1'),
+                booking('b2', 'L2', '2024-01-10', '2024-01-12', host='H2')]
+
+    first = HostAnalytics(max_workers=1, cache_path=cache_path).compute(bookings, [], START, END)
+    assert len(computed) == 2
+
+    computed.clear()
+    second = HostAnalytics(max_workers=1, cache_path=cache_path).compute(bookings, [], START, END)
+    assert computed == [] and second == first
+
+    bookings[1] = {**bookings[1], 'status': 'cancelled'}
+    HostAnalytics(max_workers=1, cache_path=cache_path).compute(bookings, [], START, END)
+    assert [job[0][0]['_id'] for job in computed] == ['b2']
@@ -0,0 +1,162 @@
+import datetime
+import os
+
+import pytest
+import requests
+
+from nu3pbnb import cache as cache_module
+from nu3pbnb.cache import ResponseCache
+from nu3pbnb.client import Nu3PBnBAPI
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+    return clock
+
+
+def stored_size(cache):
+    return cache._connection().execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+
+def keys(cache):
+    return {row[0] for row in cache._connection().execute('SELECT key FROM entries')}
+
+
+def test_eviction_drops_least_recently_used_until_under_the_target(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'cache.db'), max_bytes=10_000, compression_level=0)
+    for i in range(9):
+        clock.now += 60
+        cache.set(f"http://api/listings/{i}", os.urandom(1000), 300)
+    clock.now += 60
+    cache.get('http://api/listings/0')  # recently used again
+
+    clock.now += 60
+    cache.set('http://api/listings/new', os.urandom(1000), 300)
+
+    stats = cache.stats()
+    assert stats['bytes'] == stored_size(cache) <= 9_000
+    # Only as many entries as needed are evicted, oldest first
+    assert keys(cache) == {f"http://api/listings/{i}" for i in (0, 3, 4, 5, 6, 7, 8)} | {'http://api/listings/new'}
+
+
+def test_oversized_bodies_are_not_stored(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'), max_bytes=100, compression_level=0)
+    cache.set('http://api/listings/1', os.urandom(500), 300)
+    assert cache.stats() == {'entries': 0, 'bytes': 0, 'maxBytes': 100}
+
+
+def test_invalidate_drops_the_url_and_everything_under_it(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'))
+    for key in ('http://api/listings', 'http://api/listings#user', 'http://api/listings?page=2',
+                'http://api/listings/1', 'http://api/listings/1/availability', 'http://api/listingsX',
+                'http://api/reviews/listing/1'):
+        cache.set(key, b'{}', 300)
+
+    assert cache.invalidate('http://api/listings') == 5
+    assert keys(cache) == {'http://api/listingsX', 'http://api/reviews/listing/1'}
+    assert cache.stats()['bytes'] == stored_size(cache)
+
+
+def test_writes_invalidate_the_prefixes_they_affect(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'))
+    assert cache.invalidated_by('/reviews/123') == ('/reviews/listing', '/listings')
+    assert cache.invalidated_by('/listings/5?x=1') == ('/listings',)
+    assert cache.invalidated_by('/users/1/wishlist') == ()
+    assert cache.ttl_for('/reviews/listing/5') == 300
+    assert cache.ttl_for('/bookings') is None
+
+
+def test_stale_entries_are_leased_to_one_revalidator(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'cache.db'), stale_ttl=60, lease_seconds=30)
+    cache.set('http://api/listings', b'[]', 10, etag='W/"1"')
+    clock.now += 20
+    entry = cache.get('http://api/listings')
+    assert not entry.fresh and entry.servable_stale
+
+    assert cache.try_lease('http://api/listings')
+    assert not cache.try_lease('http://api/listings')
+    clock.now += 31
+    assert cache.try_lease('http://api/listings')
+
+    # A 304 extends the entry and releases the lease
+    cache.refresh('http://api/listings', 10)
+    assert cache.get('http://api/listings').fresh
+    assert cache.try_lease('http://api/listings')
+
+
+class FakeSession:
+    """Stands in for requests.Session, answering from a table of (status, body, headers)"""
+
+    def __init__(self):
+        self.headers = {}
+        self.calls = []
+        self.responses = {}
+
+    def request(self, method, url, headers=None, json=None):
+        self.calls.append((method, url, dict(headers or {})))
+        status, body, response_headers = self.responses.get((method, url), (200, b'{}', {}))
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.headers.update(response_headers)
+        response.request = requests.Request(method, url).prepare()
+        response.elapsed = datetime.timedelta(0)
+        return response
+
+
+@pytest.fixture
+def api(tmp_path):
+    api = Nu3PBnBAPI('key', base_url='http://api', cache=ResponseCache(str(tmp_path / 'cache.db')))
+    api.session = FakeSession()
+    return api
+
+
+def test_client_revalidates_stale_entries_with_their_etag(api, clock):
+    session = api.session
+    session.responses[('GET', 'http://api/listings/1')] = (200, b'{"title": "Loft"}', {'ETag': 'W/"a"'})
+    assert api._request('/listings/1') == {'title': 'Loft'}
+    assert api._request('/listings/1') == {'title': 'Loft'}
+    assert len(session.calls) == 1
+
+    clock.now += 301
+    session.responses[('GET', 'http://api/listings/1')] = (304, b'', {})
+    assert api._request('/listings/1') == {'title': 'Loft'}
+    assert session.calls[-1][2]['If-None-Match'] == 'W/"a"'
+    assert api._request('/listings/1') == {'title': 'Loft'}
+    assert len(session.calls) == 2
+
+
+def test_client_writes_drop_affected_cached_reads(api):
+    session = api.session
+    api._request('/listings/1')
+    api._request('/reviews/listing/1')
+    api._request('/listings/1', method='PUT', data={'price': 90})
+    api._request('/reviews/listing/1')
+    assert [call[:2] for call in session.calls] == [
+        ('GET', 'http://api/listings/1'), ('GET', 'http://api/reviews/listing/1'),
+        ('PUT', 'http://api/listings/1')]
+
+    api._request('/reviews', method='POST', data={'listingId': '1'})
+    api._request('/listings/1')
+    api._request('/reviews/listing/1')
+    assert [call[1] for call in session.calls[-2:]] == ['http://api/listings/1', 'http://api/reviews/listing/1']
+
+
+def test_failed_writes_keep_the_cache(api):
+    session = api.session
+    api._request('/listings/1')
+    session.responses[('DELETE', 'http://api/listings/1')] = (403, b'{}', {})
+    with pytest.raises(requests.HTTPError):
+        api._request('/listings/1', method='DELETE')
+    api._request('/listings/1')
+    assert [call[0] for call in session.calls] == ['GET', 'DELETE']
@@ -0,0 +1,273 @@
+"""
+Nu3PBnB client tracing
+
+A minimal, dependency-free tracer for Nu3PBnBAPI. Each API request becomes a
+client span whose context is propagated to the server in a W3C
+``traceparent`` header. Finished spans are queued and exported in batches on
+a background thread as OTLP/JSON, either to a local file (one export request
+per line) or to an OTLP/HTTP collector.
+
+Sampling is decided once per trace at its root span. Unsampled spans still
+propagate a ``traceparent`` (with the sampled flag cleared) but are never
+recorded or exported, so the cost at low sample rates is generating two ids.
+"""
+
+import atexit
+import contextvars
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_ID_SEGMENT = re.compile(r'^(?:[0-9a-fA-F]{24}|\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$')
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('nu3pbnb_current_span', default=None)
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Collapse ids in an endpoint path, e.g. ``/bookings/64f...`` -> ``/bookings/:id``"""
+    path = endpoint.split('?', 1)[0]
+    return '/'.join(':id' if _ID_SEGMENT.match(segment) else segment for segment in path.split('/'))
+
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes: Dict) -> List[Dict]:
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items()]
+
+
+class Span:
+    """A single timed operation; only sampled spans are recorded"""
+
+    __slots__ = ('_tracer', 'name', 'kind', 'trace_id', 'span_id', 'parent_id', 'sampled',
+                 'attributes', 'start_ns', 'end_ns', 'status_code', 'status_message')
+
+    def __init__(self, tracer, name: str, trace_id: int, span_id: int, parent_id: Optional[int],
+                 sampled: bool, kind: int = SPAN_KIND_INTERNAL, attributes: Optional[Dict] = None):
+        self._tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes = dict(attributes or {}) if sampled else {}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status_code = STATUS_UNSET
+        self.status_message = ''
+
+    @property
+    def traceparent(self) -> str:
+        """W3C Trace Context header value for this span"""
+        return f"00-{self.trace_id:032x}-{self.span_id:016x}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key: str, value) -> None:
+        if self.sampled and value is not None:
+            self.attributes[key] = value
+
+    def set_status(self, code: int, message: str = '') -> None:
+        self.status_code = code
+        self.status_message = message
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.sampled:
+            self._tracer._on_end(self)
+
+    def to_otlp(self) -> Dict:
+        span = {
+            'traceId': f'{self.trace_id:032x}',
+            'spanId': f'{self.span_id:016x}',
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': _otlp_attributes(self.attributes),
+            'status': {'code': self.status_code, 'message': self.status_message},
+        }
+        if self.parent_id:
+            span['parentSpanId'] = f'{self.parent_id:016x}'
+        return span
+
+
+class FileSpanExporter:
+    """Append each batch to a file as one OTLP/JSON export request per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, payload: Dict) -> None:
+        with open(self.path, 'a', encoding='utf-8') as handle:
+            handle.write(json.dumps(payload, separators=(',', ':')))
+            handle.write('\n')
+
+    def shutdown(self) -> None:
+        pass
+
+
+class OTLPHttpSpanExporter:
+    """POST each batch to an OTLP/HTTP JSON endpoint, e.g. ``http://localhost:4318/v1/traces``"""
+
+    def __init__(self, endpoint: str, timeout: float = 10.0):
+        import requests
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def export(self, payload: Dict) -> None:
+        self.session.post(self.endpoint, json=payload, timeout=self.timeout).raise_for_status()
+
+    def shutdown(self) -> None:
+        self.session.close()
+
+
+class BatchSpanProcessor:
+    """
+    Queue finished spans and export them from a background thread, either
+    when a full batch is ready or every ``schedule_delay`` seconds. When the
+    queue is full the oldest spans are dropped rather than blocking callers.
+    """
+
+    def __init__(self, exporter, service_name: str = 'nu3pbnb-client', max_queue_size: int = 2048,
+                 max_export_batch_size: int = 512, schedule_delay: float = 5.0):
+        self.exporter = exporter
+        self.max_export_batch_size = max_export_batch_size
+        self.schedule_delay = schedule_delay
+        self.dropped = 0
+        self._resource = {'attributes': _otlp_attributes({'service.name': service_name})}
+        self._queue: deque = deque(maxlen=max_queue_size)
+        self._condition = threading.Condition()
+        self._shutdown = False
+        self._thread = threading.Thread(target=self._worker, name='nu3pbnb-span-export', daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def on_end(self, span: Span) -> None:
+        with self._condition:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(span)
+            if len(self._queue) >= self.max_export_batch_size:
+                self._condition.notify()
+
+    def _drain(self) -> List[Span]:
+        with self._condition:
+            batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.max_export_batch_size))]
+        return batch
+
+    def _export(self, batch: List[Span]) -> None:
+        payload = {'resourceSpans': [{
+            'resource': self._resource,
+            'scopeSpans': [{'scope': {'name': 'nu3pbnb'}, 'spans': [span.to_otlp() for span in batch]}],
+        }]}
+        try:
+            self.exporter.export(payload)
+        except Exception:
+            # Tracing must never break the caller; the batch is lost
+            self.dropped += len(batch)
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                if not self._shutdown and len(self._queue) < self.max_export_batch_size:
+                    self._condition.wait(self.schedule_delay)
+                stopping = self._shutdown
+            while True:
+                batch = self._drain()
+                if not batch:
+                    break
+                self._export(batch)
+            if stopping:
+                return
+
+    def force_flush(self) -> None:
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._export(batch)
+
+    def shutdown(self) -> None:
+        with self._condition:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            self._condition.notify()
+        self._thread.join()
+        self.exporter.shutdown()
+
+
+class Tracer:
+    """Create spans, make sampling decisions and hand finished spans to a processor"""
+
+    def __init__(self, processor: Optional[BatchSpanProcessor] = None, sample_rate: float = 1.0):
+        self.processor = processor
+        self.sample_rate = sample_rate
+        self._random = random.Random()
+
+    def start_span(self, name: str, kind: int = SPAN_KIND_INTERNAL, attributes: Optional[Dict] = None) -> Span:
+        """Start a span as a child of the current span, or as a new trace root"""
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+        else:
+            trace_id, parent_id = self._random.getrandbits(128) or 1, None
+            sampled = self.processor is not None and self._random.random() < self.sample_rate
+        span_id = self._random.getrandbits(64) or 1
+        return Span(self, name, trace_id, span_id, parent_id, sampled, kind, attributes)
+
+    @contextmanager
+    def span(self, name: str, attributes: Optional[Dict] = None):
+        """Run a block inside a span; API requests made within it become its children"""
+        span = self.start_span(name, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.set_status(STATUS_ERROR, str(error))
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def _on_end(self, span: Span) -> None:
+        if self.processor is not None:
+            self.processor.on_end(span)
+
+    def shutdown(self) -> None:
+        if self.processor is not None:
+            self.processor.shutdown()
+
+
+def file_tracer(path: str, sample_rate: float = 1.0, **processor_options) -> Tracer:
+    """Tracer exporting OTLP/JSON lines to ``path``"""
+    return Tracer(BatchSpanProcessor(FileSpanExporter(path), **processor_options), sample_rate=sample_rate)
+
+
+def otlp_http_tracer(endpoint: str, sample_rate: float = 1.0, **processor_options) -> Tracer:
+    """Tracer exporting to an OTLP/HTTP collector"""
+    return Tracer(BatchSpanProcessor(OTLPHttpSpanExporter(endpoint), **processor_options), sample_rate=sample_rate)
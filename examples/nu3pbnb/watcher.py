@@ -0,0 +1,207 @@
+"""
+Nu3PBnB booking watcher
+Turn polling of a user's bookings into typed booking events
+
+Hosts poll ``GET /host/bookings`` (every booking request for their listings)
+and guests ``GET /bookings`` (their own requests).
+
+The watcher keeps only a compact state per booking, id -> (status, start
+date, end date, updatedAt), never the populated documents. Each poll is a
+conditional request: when nothing changed the API answers 304 and the poll
+costs no parsing or diffing at all. Otherwise each booking's tuple is
+looked up by id and only the bookings that differ produce events.
+
+Polling adapts to activity: the interval drops to ``min_interval`` after a
+change and grows by ``backoff`` on every quiet poll (or failure) up to
+``max_interval``.
+
+    watcher = BookingWatcher(api, role='host')
+    watcher.on(NEW_REQUEST, lambda event: print('New request', event.booking_id))
+    watcher.run()
+
+or, from asyncio code:
+
+    async for event in watcher.events():
+        ...
+"""
+
+import asyncio
+import random
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+NEW_REQUEST = 'new_request'
+ACCEPTED = 'accepted'
+DECLINED = 'declined'
+CANCELLED = 'cancelled'
+UPDATED = 'updated'
+
+EVENT_TYPES = (NEW_REQUEST, ACCEPTED, DECLINED, CANCELLED, UPDATED)
+
+# Booking status -> event emitted when a booking enters it
+STATUS_EVENTS = {
+    'pending': NEW_REQUEST,
+    'approved': ACCEPTED,
+    'confirmed': ACCEPTED,
+    'declined': DECLINED,
+    'cancelled': CANCELLED,
+}
+
+# (status, startDate, endDate, updatedAt)
+BookingState = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+def booking_state(booking: Dict) -> BookingState:
+    return (booking.get('status'), booking.get('startDate'), booking.get('endDate'), booking.get('updatedAt'))
+
+
+class BookingEvent:
+    __slots__ = ('type', 'booking_id', 'status', 'previous_status', 'start_date', 'end_date', 'booking')
+
+    def __init__(self, event_type: str, booking_id: str, state: BookingState,
+                 previous: Optional[BookingState] = None, booking: Optional[Dict] = None):
+        self.type = event_type
+        self.booking_id = booking_id
+        self.status, self.start_date, self.end_date = state[:3]
+        self.previous_status = previous[0] if previous else None
+        # The booking as returned by the API; None when it disappeared from the listing
+        self.booking = booking
+
+    def to_dict(self) -> Dict:
+        return {
+            'type': self.type,
+            'bookingId': self.booking_id,
+            'status': self.status,
+            'previousStatus': self.previous_status,
+            'startDate': self.start_date,
+            'endDate': self.end_date,
+        }
+
+    def __repr__(self) -> str:
+        return f"BookingEvent({self.type!r}, {self.booking_id!r}, {self.previous_status!r} -> {self.status!r})"
+
+
+def diff_bookings(state: Dict[str, BookingState], bookings) -> Tuple[Dict[str, BookingState], List[BookingEvent]]:
+    """
+    Events between a previous state and the current bookings, plus the new
+    state. ``bookings`` is a list, as the host endpoint returns, or a
+    ``{'bookings': [...]}`` response as the guest one does. Bookings no longer
+    returned are reported as cancelled.
+    """
+    if isinstance(bookings, dict):
+        bookings = bookings.get('bookings') or []
+    current: Dict[str, BookingState] = {}
+    events = []
+    for booking in bookings:
+        booking_id = str(booking.get('_id'))
+        new = current[booking_id] = booking_state(booking)
+        old = state.get(booking_id)
+        if old == new:
+            continue
+        if old is None or old[0] != new[0]:
+            event_type = STATUS_EVENTS.get(new[0], UPDATED)
+        else:
+            event_type = UPDATED
+        events.append(BookingEvent(event_type, booking_id, new, old, booking))
+
+    for booking_id in state.keys() - current.keys():
+        old = state[booking_id]
+        if old[0] != 'cancelled':
+            events.append(BookingEvent(CANCELLED, booking_id, ('cancelled',) + old[1:], old))
+    return current, events
+
+
+class BookingWatcher:
+    """Poll the current user's bookings and emit an event for each change"""
+
+    def __init__(self, api, role: str = 'host', min_interval: float = 5.0, max_interval: float = 120.0,
+                 backoff: float = 1.5, emit_existing: bool = False):
+        if role not in ('host', 'guest'):
+            raise ValueError("role must be 'host' or 'guest'")
+        self.api = api
+        self.role = role
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.emit_existing = emit_existing
+        self.interval = min_interval
+        self.state: Dict[str, BookingState] = {}
+        self.etag: Optional[str] = None
+        self.polls = 0
+        self._synced = False
+        self._callbacks: Dict[Optional[str], List[Callable[[BookingEvent], None]]] = {}
+        self._stop = threading.Event()
+
+    def on(self, event_type: Optional[str], callback: Callable[[BookingEvent], None]) -> None:
+        """Call ``callback`` for every event of a type, or of every type when None"""
+        if event_type is not None and event_type not in EVENT_TYPES:
+            raise ValueError(f"unknown event type {event_type!r}")
+        self._callbacks.setdefault(event_type, []).append(callback)
+
+    def poll(self) -> List[BookingEvent]:
+        """Fetch once, update the state and dispatch the events; adjusts the interval"""
+        self.polls += 1
+        try:
+            if self.role == 'host':
+                response, self.etag = self.api.get_host_bookings_if_changed(self.etag)
+            else:
+                response, self.etag = self.api.get_bookings_if_changed(etag=self.etag)
+        except Exception:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+            raise
+
+        events = []
+        if response is not None:
+            self.state, events = diff_bookings(self.state, response)
+            if not self._synced:
+                # The first poll only establishes the baseline
+                self._synced = True
+                if not self.emit_existing:
+                    events = []
+        self.interval = self.min_interval if events else min(self.interval * self.backoff, self.max_interval)
+
+        for event in events:
+            for callback in self._callbacks.get(event.type, []) + self._callbacks.get(None, []):
+                try:
+                    callback(event)
+                except Exception as error:
+                    print(f"Booking watcher callback failed: {error}", file=sys.stderr)
+        return events
+
+    def _next_delay(self) -> float:
+        # A little jitter keeps many watchers from polling in lockstep
+        return self.interval * random.uniform(0.9, 1.1)
+
+    def iter_events(self) -> Iterator[BookingEvent]:
+        """Poll until stopped, yielding events as they are found"""
+        while not self._stop.is_set():
+            try:
+                yield from self.poll()
+            except Exception as error:
+                print(f"Booking poll failed: {error}", file=sys.stderr)
+            self._stop.wait(self._next_delay())
+
+    def run(self) -> None:
+        """Poll until stopped, delivering events to the registered callbacks"""
+        for _ in self.iter_events():
+            pass
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def events(self):
+        """Async iterator of events; each poll runs in the default executor"""
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            try:
+                events = await loop.run_in_executor(None, self.poll)
+            except Exception as error:
+                print(f"Booking poll failed: {error}", file=sys.stderr)
+                events = []
+            for event in events:
+                yield event
+            deadline = time.monotonic() + self._next_delay()
+            while not self._stop.is_set() and time.monotonic() < deadline:
+                await asyncio.sleep(min(0.5, deadline - time.monotonic()))
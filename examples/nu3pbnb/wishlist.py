@@ -0,0 +1,130 @@
+"""
+Nu3PBnB wishlist sync
+Reconcile users' wishlists with a desired set of listing ids
+
+Each user's wishlist is fetched once, the difference with the desired set is
+computed locally, and only the listings to add or remove are sent, with
+bounded parallelism across all users. A sync therefore costs one request per
+user plus one per actual change.
+
+The API updates a wishlist by reading the user, changing the array and
+saving it back, so two concurrent changes to the same user can overwrite
+each other. Changes are therefore sent one at a time per user; users are
+still synced in parallel.
+"""
+
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Deque, Dict, Iterable, List, Mapping, Set, Tuple
+
+ADD = 'add'
+REMOVE = 'remove'
+
+
+def wishlist_ids(wishlist: Iterable) -> Set[str]:
+    """Listing ids of a wishlist response, whose items may be populated listings"""
+    return {str(item.get('_id')) if isinstance(item, dict) else str(item) for item in wishlist or []}
+
+
+def diff_wishlist(current: Iterable[str], desired: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """(listing ids to add, listing ids to remove)"""
+    current, desired = set(current), {str(listing_id) for listing_id in desired}
+    return sorted(desired - current), sorted(current - desired)
+
+
+class WishlistSyncResult:
+    """Outcome of reconciling one user's wishlist"""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.added: List[str] = []
+        self.removed: List[str] = []
+        self.failed: List[Tuple[str, str, str]] = []  # (operation, listing id, error)
+        self.requests = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def to_dict(self) -> Dict:
+        return {
+            'userId': self.user_id,
+            'added': self.added,
+            'removed': self.removed,
+            'failed': [{'operation': op, 'listingId': listing_id, 'error': error}
+                       for op, listing_id, error in self.failed],
+            'requests': self.requests,
+        }
+
+
+def sync_wishlists(api, desired_by_user: Mapping[str, Iterable[str]], max_workers: int = 8,
+                   dry_run: bool = False) -> Dict[str, WishlistSyncResult]:
+    """
+    Make each user's wishlist equal to the given listing ids.
+
+    Fetches and changes share one pool of ``max_workers`` threads with at
+    most two requests per worker in flight, so the work per completion stays
+    constant however many users are synced. A user's next change is sent
+    before any new user is fetched, and each user has at most one request in
+    flight. Failures are recorded per user rather than raised.
+    """
+    results = {str(user_id): WishlistSyncResult(str(user_id)) for user_id in desired_by_user}
+    desired = {str(user_id): listing_ids for user_id, listing_ids in desired_by_user.items()}
+    # Changes not yet sent, per user
+    queues: Dict[str, Deque[Tuple[str, str]]] = {}
+    max_in_flight = max_workers * 2
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def submit(fn, *args):
+            # Keep the caller's tracing context in the worker threads
+            return pool.submit(contextvars.copy_context().run, fn, *args)
+
+        def send_next(user_id):
+            if queues.get(user_id):
+                operation, listing_id = queues[user_id].popleft()
+                fn = api.add_to_wishlist if operation == ADD else api.remove_from_wishlist
+                pending[submit(fn, user_id, listing_id)] = (operation, user_id, listing_id)
+
+        users = iter(results)
+        pending = {}
+        while True:
+            while len(pending) < max_in_flight:
+                user_id = next(users, None)
+                if user_id is None:
+                    break
+                pending[submit(api.get_wishlist, user_id)] = (None, user_id, None)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                operation, user_id, listing_id = pending.pop(future)
+                result = results[user_id]
+                result.requests += 1
+                error = future.exception()
+
+                if operation is None:
+                    if error is not None:
+                        result.failed.append(('fetch', '', str(error)))
+                        continue
+                    to_add, to_remove = diff_wishlist(wishlist_ids(future.result()), desired[user_id])
+                    if dry_run:
+                        result.added, result.removed = to_add, to_remove
+                        continue
+                    queues[user_id] = deque([(ADD, listing_id) for listing_id in to_add] +
+                                            [(REMOVE, listing_id) for listing_id in to_remove])
+                elif error is not None:
+                    result.failed.append((operation, listing_id, str(error)))
+                elif operation == ADD:
+                    result.added.append(listing_id)
+                else:
+                    result.removed.append(listing_id)
+                send_next(user_id)
+
+    return results
+
+
+def sync_wishlist(api, user_id: str, desired_ids: Iterable[str], max_workers: int = 4,
+                  dry_run: bool = False) -> WishlistSyncResult:
+    """Make one user's wishlist equal to ``desired_ids``"""
+    return sync_wishlists(api, {user_id: desired_ids}, max_workers=max_workers, dry_run=dry_run)[str(user_id)]
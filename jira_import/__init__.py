@@ -0,0 +1,7 @@
+"""
+Helpers for generate-jira-import.py
+"""
+
+from .spec import FIELDNAMES, HierarchyIndex, SpecError, iter_issues, write_csv
+
+__all__ = ['FIELDNAMES', 'HierarchyIndex', 'SpecError', 'iter_issues', 'write_csv']
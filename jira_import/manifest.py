@@ -0,0 +1,133 @@
+"""
+Incremental JIRA imports
+
+A manifest records, for every issue of the previous run, a stable key and a
+hash of its CSV content. Diffing a new run against it lets the generator
+emit only issues that are new or changed, plus a report of issues that have
+disappeared, so a re-import scales with the size of the change.
+
+An issue's key is its ``Key`` field when the spec provides one, otherwise a
+slug of its summary. Each entry also records the key JIRA assigned to the
+issue (e.g. ``SHT-42``), taken from a push state file or a CSV export of the
+project; JIRA's CSV importer can only update an existing issue by that key.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .spec import csv_row
+
+MANIFEST_VERSION = 1
+
+NEW = 'new'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+# A second issue whose key is already taken in this run
+COLLISION = 'collision'
+
+_SLUG = re.compile(r'[^a-z0-9]+')
+
+
+def issue_key(issue: Dict) -> str:
+    key = str(issue.get('Key') or '').strip()
+    if key:
+        return key
+    return _SLUG.sub('-', str(issue.get('Summary') or '').lower()).strip('-')
+
+
+def content_hash(issue: Dict) -> str:
+    """Hash of the issue as it would appear in the CSV"""
+    encoded = json.dumps(csv_row(issue), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def load_jira_keys(path: Optional[str]) -> Dict[str, str]:
+    """
+    Spec key -> JIRA key from a push state file (``.jsonl``) or a CSV export
+    of the JIRA project (``Issue key`` and ``Summary`` columns, matched by
+    summary slug)
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    keys = {}
+    with open(path, newline='', encoding='utf-8') as handle:
+        if path.endswith('.jsonl'):
+            for line in handle:
+                if line.strip():
+                    entry = json.loads(line)
+                    keys[entry['key']] = entry['jira']
+        else:
+            for row in csv.DictReader(handle):
+                row = {name.strip().lower(): value for name, value in row.items() if name}
+                if row.get('issue key') and row.get('summary'):
+                    keys[issue_key({'Summary': row['summary']})] = row['issue key'].strip()
+    return keys
+
+
+class Manifest:
+    """Key -> (content hash, issue type, summary, JIRA key) for one generated import"""
+
+    def __init__(self, entries: Dict[str, List[str]] = None):
+        self.entries: Dict[str, List[str]] = entries or {}
+
+    @classmethod
+    def load(cls, path: str) -> 'Manifest':
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as handle:
+            data = json.load(handle)
+        if data.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"{path}: unsupported manifest version {data.get('version')!r}")
+        return cls(data['issues'])
+
+    def save(self, path: str) -> None:
+        """Write atomically so an interrupted run never leaves a torn manifest"""
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            json.dump({'version': MANIFEST_VERSION, 'issues': self.entries}, handle, separators=(',', ':'))
+        os.replace(temporary, path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def jira_key(self, key: str) -> str:
+        entry = self.entries.get(key)
+        return entry[3] if entry else ''
+
+
+def diff_issues(issues: Iterable[Dict], previous: Manifest, current: Manifest,
+                jira_keys: Optional[Dict[str, str]] = None) -> Iterator[Tuple[str, str, Dict]]:
+    """
+    Classify each issue against the previous manifest while recording it in
+    the current one. Yields ``(status, key, issue)``; an issue whose key was
+    already used earlier in the run is yielded as a COLLISION and not
+    recorded, so it never overwrites the first one's entry.
+    """
+    jira_keys = jira_keys or {}
+    for issue in issues:
+        key = issue_key(issue)
+        if key in current:
+            yield COLLISION, key, issue
+            continue
+        digest = content_hash(issue)
+        jira_key = jira_keys.get(key) or previous.jira_key(key)
+        current.entries[key] = [digest, str(issue.get('Issue Type') or ''), str(issue.get('Summary') or ''), jira_key]
+        entry = previous.entries.get(key)
+        if entry is None:
+            yield NEW, key, issue
+        elif entry[0] != digest:
+            yield CHANGED, key, issue
+        else:
+            yield UNCHANGED, key, issue
+
+
+def deleted_entries(previous: Manifest, current: Manifest) -> List[Tuple[str, str, str, str]]:
+    """(key, JIRA key, issue type, summary) of issues present before but not now"""
+    return [(key, entry[3], entry[1], entry[2]) for key, entry in previous.entries.items() if key not in current]
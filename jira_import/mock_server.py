@@ -0,0 +1,249 @@
+"""
+Local stand-in for the JIRA REST API
+
+Implements just enough of JIRA for push mode to be exercised and benchmarked
+without a real instance: ``POST /rest/api/2/issue/bulk``,
+``GET /rest/api/2/issue/<key>`` and ``GET /rest/api/2/search`` for the
+``project = "X" AND (summary ~ "\\"words\\"" OR ...)`` queries push mode
+sends. Parent links (``parent`` or an Epic Link custom field) must point at
+issues that already exist. Latency, a request rate limit (answered with 429
+and ``Retry-After``), random transient failures and lost responses (the
+request is applied but the connection drops before the answer) can be
+simulated.
+
+    python -m jira_import.mock_server --port 8089 --latency 0.05 --rate-limit 20
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .push import BULK_CREATE_PATH, MAX_BATCH_SIZE, SEARCH_PATH
+
+ISSUE_PATH = '/rest/api/2/issue/'
+EPIC_LINK_FIELDS = ('parent', 'customfield_10014')
+
+_JQL_PROJECT = re.compile(r'project\s*=\s*"?([A-Za-z0-9_]+)"?')
+_JQL_SUMMARY = re.compile(r'summary\s*~\s*"\\"(.*?)\\""')
+_WORD = re.compile(r'\w+')
+
+
+class MockJira:
+    """Issue store plus the simulated failure modes"""
+
+    def __init__(self, project: str = 'SHT', latency: float = 0.0, rate_limit: Optional[float] = None,
+                 failure_rate: float = 0.0, lost_response_rate: float = 0.0):
+        self.project = project
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.failure_rate = failure_rate
+        self.lost_response_rate = lost_response_rate
+        self.lost_responses = 0
+        self.issues: Dict[str, Dict] = {}
+        self.requests = 0
+        self.throttled = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    def throttle(self) -> Optional[float]:
+        """Seconds the caller must wait, or None if the request may proceed"""
+        with self._lock:
+            self.requests += 1
+            if not self.rate_limit:
+                return None
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start, self._window_count = now, 0
+            if self._window_count >= self.rate_limit:
+                self.throttled += 1
+                return 1.0 - (now - self._window_start)
+            self._window_count += 1
+            return None
+
+    def _validate(self, fields: Dict) -> Dict[str, str]:
+        errors = {}
+        if (fields.get('project') or {}).get('key') != self.project:
+            errors['project'] = f"project must be {self.project}"
+        if not fields.get('summary'):
+            errors['summary'] = 'You must specify a summary of the issue.'
+        if not (fields.get('issuetype') or {}).get('name'):
+            errors['issuetype'] = 'Specify an issue type'
+        for name in EPIC_LINK_FIELDS:
+            link = fields.get(name)
+            if link:
+                key = link.get('key') if isinstance(link, dict) else link
+                if key not in self.issues:
+                    errors[name] = f"Issue '{key}' does not exist"
+        return errors
+
+    def bulk_create(self, issue_updates: List[Dict]) -> Tuple[int, Dict]:
+        if len(issue_updates) > MAX_BATCH_SIZE:
+            return 400, {'errorMessages': [f"At most {MAX_BATCH_SIZE} issues per request"]}
+        created, failed = [], []
+        with self._lock:
+            for number, update in enumerate(issue_updates):
+                fields = update.get('fields') or {}
+                errors = self._validate(fields)
+                if errors:
+                    failed.append({'status': 400, 'failedElementNumber': number,
+                                   'elementErrors': {'errorMessages': [], 'errors': errors}})
+                    continue
+                issue_id = self._next_id
+                self._next_id += 1
+                key = f"{self.project}-{issue_id}"
+                self.issues[key] = {'id': str(issue_id), 'key': key, 'fields': fields}
+                created.append({'id': str(issue_id), 'key': key, 'self': f"{ISSUE_PATH}{issue_id}"})
+        return (201 if created or not failed else 400), {'issues': created, 'errors': failed}
+
+    def search(self, jql: str, start: int = 0, max_results: int = 50) -> Tuple[int, Dict]:
+        project = _JQL_PROJECT.search(jql)
+        phrases = [' '.join(_WORD.findall(phrase.lower())) for phrase in _JQL_SUMMARY.findall(jql)]
+
+        def matches_jql(issue):
+            words = ' '.join(_WORD.findall(str(issue['fields'].get('summary')).lower()))
+            return ((project is None or issue['key'].startswith(project.group(1) + '-'))
+                    and (not phrases or any(phrase in words for phrase in phrases)))
+
+        with self._lock:
+            matches = [issue for issue in self.issues.values() if matches_jql(issue)]
+        matches.sort(key=lambda issue: int(issue['id']))
+        page = [{'id': issue['id'], 'key': issue['key'], 'fields': {'summary': issue['fields'].get('summary')}}
+                for issue in matches[start:start + max_results]]
+        return 200, {'startAt': start, 'maxResults': max_results, 'total': len(matches), 'issues': page}
+
+    def lose_response(self) -> bool:
+        """Whether to drop the connection instead of answering an applied request"""
+        if self.lost_response_rate and random.random() < self.lost_response_rate:
+            with self._lock:
+                self.lost_responses += 1
+            return True
+        return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    jira: MockJira = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict, headers: Optional[Dict] = None) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _admit(self) -> bool:
+        wait = self.jira.throttle()
+        if wait is not None:
+            self._send(429, {'errorMessages': ['Rate limit exceeded']}, {'Retry-After': f"{max(wait, 0.01):.2f}"})
+            return False
+        if self.jira.latency:
+            time.sleep(self.jira.latency)
+        if self.jira.failure_rate and random.random() < self.jira.failure_rate:
+            self._send(503, {'errorMessages': ['Service temporarily unavailable']})
+            return False
+        return True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self._send(400, {'errorMessages': ['Invalid JSON']})
+        if self.path != BULK_CREATE_PATH:
+            return self._send(404, {'errorMessages': ['Not found']})
+        if self._admit():
+            response = self.jira.bulk_create(body.get('issueUpdates') or [])
+            if self.jira.lose_response():
+                # The issues exist, but the client never hears about them
+                self.close_connection = True
+                return
+            self._send(*response)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == SEARCH_PATH:
+            if self._admit():
+                query = parse_qs(url.query)
+                self._send(*self.jira.search((query.get('jql') or [''])[0],
+                                             int((query.get('startAt') or ['0'])[0]),
+                                             int((query.get('maxResults') or ['50'])[0])))
+            return
+        if not self.path.startswith(ISSUE_PATH):
+            return self._send(404, {'errorMessages': ['Not found']})
+        if self._admit():
+            issue = self.jira.issues.get(self.path[len(ISSUE_PATH):])
+            if issue is None:
+                return self._send(404, {'errorMessages': ['Issue does not exist']})
+            self._send(200, issue)
+
+
+class MockJiraServer:
+    """Run a MockJira on a background thread; usable as a context manager"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, **options):
+        self.jira = MockJira(**options)
+        handler = type('Handler', (_Handler,), {'jira': self.jira})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockJiraServer':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local stand-in JIRA server for push mode')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--project', default='SHT')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--rate-limit', type=float, help='requests per second before answering 429')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of requests answered 503')
+    parser.add_argument('--lost-response-rate', type=float, default=0.0,
+                        help='fraction of bulk creates that are applied but never answered')
+    args = parser.parse_args(argv)
+
+    server = MockJiraServer(args.host, args.port, project=args.project, latency=args.latency,
+                            rate_limit=args.rate_limit, failure_rate=args.failure_rate,
+                            lost_response_rate=args.lost_response_rate)
+    print(f"Mock JIRA for project {args.project} listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"{server.jira.requests} requests, {server.jira.throttled} throttled, {len(server.jira.issues)} issues")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,408 @@
+"""
+Push issues straight to JIRA
+
+Instead of writing a CSV for manual upload, issues are created through the
+bulk-create REST endpoint (``POST /rest/api/2/issue/bulk``, at most 50
+issues per call). Parents are created before their children: issues are
+grouped into levels by their depth in the ``Epic Link`` hierarchy and each
+level's batches are sent concurrently once the level above has finished.
+
+Created issues are appended to a push state file (spec key -> JIRA key, one
+JSON object per line), so a rerun skips everything that already exists and
+resolves parent links to the keys JIRA assigned last time.
+
+Requests that hit a rate limit (429) or a transient failure are retried with
+backoff, honouring ``Retry-After``; a rate-limit response pauses every
+worker, not just the one that received it. Bulk create is not idempotent, so
+it is only re-sent blindly when JIRA refused it outright (429, 503). After a
+timeout, a dropped connection or a gateway error the batch may already have
+been created: its issues are looked up by summary first and only the ones
+that do not exist are sent again.
+"""
+
+import base64
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .manifest import issue_key
+
+BULK_CREATE_PATH = '/rest/api/2/issue/bulk'
+SEARCH_PATH = '/rest/api/2/search'
+MAX_BATCH_SIZE = 50
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Statuses that mean the request was refused before it was applied
+REJECTED_STATUSES = (429, 503)
+# Summaries per JQL query when looking issues up
+SEARCH_CHUNK_SIZE = 20
+
+
+class JiraError(Exception):
+    """JIRA rejected a request or could not be reached"""
+
+    def __init__(self, message: str, status: Optional[int] = None, unknown_outcome: bool = False):
+        super().__init__(message)
+        self.status = status
+        # No usable answer arrived, so the request may or may not have been applied
+        self.unknown_outcome = unknown_outcome
+
+
+def auth_header_from_env() -> Optional[str]:
+    """Basic auth from JIRA_EMAIL/JIRA_API_TOKEN, or a bearer JIRA_TOKEN"""
+    email, api_token = os.environ.get('JIRA_EMAIL'), os.environ.get('JIRA_API_TOKEN')
+    if email and api_token:
+        return 'Basic ' + base64.b64encode(f"{email}:{api_token}".encode('utf-8')).decode('ascii')
+    token = os.environ.get('JIRA_TOKEN')
+    return f"Bearer {token}" if token else None
+
+
+def _phrase(summary: str) -> str:
+    """JQL phrase query for a summary; text search ignores punctuation, so only words are kept"""
+    return '\\"' + ' '.join(re.findall(r'\w+', summary)) + '\\"'
+
+
+class JiraClient:
+    """Minimal JIRA REST client with rate-aware retries, safe to share between threads"""
+
+    def __init__(self, base_url: str, auth_header: Optional[str] = None, timeout: float = 30.0,
+                 max_retries: int = 5, backoff: float = 1.0):
+        self.base_url = base_url.rstrip('/')
+        self.auth_header = auth_header
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.retries = 0
+        # HTTP requests sent, retries and lookups included
+        self.requests = 0
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_for_rate_limit(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _pause(self, seconds: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def request(self, method: str, path: str, payload: Optional[Dict] = None,
+                idempotent: bool = True) -> Tuple[int, Dict]:
+        """
+        Send a request, retrying rate limits and transient failures; returns
+        (status, body). A non-idempotent request is only retried when JIRA
+        refused it; any other failure raises a JiraError with
+        ``unknown_outcome`` set so the caller can check what was applied.
+        """
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Accept': 'application/json'}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+        if self.auth_header:
+            headers['Authorization'] = self.auth_header
+        retry_statuses = RETRY_STATUSES if idempotent else REJECTED_STATUSES
+
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_rate_limit()
+            with self._lock:
+                self.requests += 1
+            request = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method)
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return response.status, json.loads(response.read() or b'{}')
+            except urllib.error.HTTPError as error:
+                status, raw, retry_after = error.code, error.read(), error.headers.get('Retry-After')
+                if status in RETRY_STATUSES and status not in retry_statuses:
+                    raise JiraError(f"{method} {path} failed with {status}", status, unknown_outcome=True) from error
+                if status not in retry_statuses or attempt == self.max_retries:
+                    try:
+                        return status, json.loads(raw or b'{}')
+                    except ValueError:
+                        raise JiraError(f"{method} {path} failed with {status}", status) from error
+            except (urllib.error.URLError, OSError) as error:
+                if not idempotent or attempt == self.max_retries:
+                    raise JiraError(f"{method} {path} failed: {error}", unknown_outcome=not idempotent) from error
+                retry_after = None
+
+            delay = self.backoff * 2 ** attempt * (0.5 + random.random())
+            if retry_after:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+            self._pause(delay)
+
+        raise JiraError(f"{method} {path} failed after {self.max_retries} retries")
+
+    def post(self, path: str, payload: Dict) -> Tuple[int, Dict]:
+        return self.request('POST', path, payload, idempotent=False)
+
+    def get(self, path: str, params: Optional[Dict] = None) -> Tuple[int, Dict]:
+        if params:
+            path += '?' + urllib.parse.urlencode(params)
+        return self.request('GET', path)
+
+    def find_by_summary(self, project: str, summaries: List[str]) -> Dict[str, str]:
+        """Summary -> key of the existing issues in ``project`` with exactly those summaries"""
+        wanted = {str(summary).strip() for summary in summaries if str(summary or '').strip()}
+        found: Dict[str, str] = {}
+        ordered = sorted(wanted)
+        for i in range(0, len(ordered), SEARCH_CHUNK_SIZE):
+            terms = ' OR '.join(f'summary ~ "{_phrase(summary)}"' for summary in ordered[i:i + SEARCH_CHUNK_SIZE])
+            jql = f'project = "{project}" AND ({terms}) ORDER BY key ASC'
+            start = 0
+            while True:
+                status, body = self.get(SEARCH_PATH, {'jql': jql, 'fields': 'summary',
+                                                      'startAt': start, 'maxResults': 100})
+                if status >= 400:
+                    raise JiraError(f"search failed with {status}: {body}", status)
+                issues = body.get('issues') or []
+                for issue in issues:
+                    summary = str((issue.get('fields') or {}).get('summary') or '').strip()
+                    if summary in wanted:
+                        found.setdefault(summary, issue.get('key'))
+                start += len(issues)
+                if not issues or start >= int(body.get('total') or 0):
+                    break
+        return found
+
+    def bulk_create(self, issue_updates: List[Dict]) -> Tuple[List[Optional[str]], Dict[int, str]]:
+        """
+        Create up to 50 issues. Returns the created key for each element (None
+        where it failed) and the error message of each failed element.
+        """
+        status, body = self.post(BULK_CREATE_PATH, {'issueUpdates': issue_updates})
+        errors = {}
+        for error in body.get('errors') or []:
+            element_errors = error.get('elementErrors') or {}
+            message = '; '.join(list((element_errors.get('errors') or {}).values())
+                                + list(element_errors.get('errorMessages') or [])) or f"status {error.get('status')}"
+            errors[int(error.get('failedElementNumber', -1))] = message
+        if status >= 400 and not errors:
+            raise JiraError(f"bulk create failed with {status}: {body}", status)
+
+        created = iter(body.get('issues') or [])
+        keys = [None if i in errors else next(created, {}).get('key') for i in range(len(issue_updates))]
+        return keys, errors
+
+
+class PushState:
+    """Append-only spec key -> JIRA key map; one JSON object per line"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.keys: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.keys[entry['key']] = entry['jira']
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def get(self, key: str) -> Optional[str]:
+        return self.keys.get(key)
+
+    def record(self, created: List[Tuple[str, str]]) -> None:
+        with self._lock:
+            self.keys.update(created)
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as handle:
+                    handle.writelines(json.dumps({'key': key, 'jira': jira}) + '\n' for key, jira in created)
+
+
+def topological_levels(issues: Iterable[Dict]) -> Tuple[List[List[Dict]], List[Tuple[str, str]]]:
+    """
+    Group issues by depth in the Epic Link hierarchy, parents first.
+    Issues without a summary, with a summary or key already used by an
+    earlier issue, on a cycle, or below a missing parent are returned as
+    (summary, reason) pairs instead.
+    """
+    by_summary: Dict[str, Dict] = {}
+    summary_of_key: Dict[str, str] = {}
+    rejected: List[Tuple[str, str]] = []
+    for issue in issues:
+        summary = str(issue.get('Summary') or '').strip()
+        key = issue_key(issue)
+        if not summary:
+            rejected.append(('', f"{issue.get('Issue Type') or 'issue'} without a summary"))
+        elif summary in by_summary:
+            rejected.append((summary, 'duplicate summary; only the first issue with it is pushed'))
+        elif key in summary_of_key:
+            rejected.append((summary, f"same key '{key}' as '{summary_of_key[key]}'"))
+        else:
+            by_summary[summary] = issue
+            summary_of_key[key] = summary
+
+    depth: Dict[str, int] = {}
+    unplaceable: Dict[str, str] = {}
+    for start in by_summary:
+        path = []
+        node = start
+        reason = None
+        while node not in depth and node not in unplaceable:
+            if node in path:
+                reason = f"Epic Link cycle through '{node}'"
+                break
+            path.append(node)
+            parent = str(by_summary[node].get('Epic Link') or '').strip()
+            if not parent:
+                depth[node] = 0
+                path.pop()
+                break
+            if parent not in by_summary:
+                reason = f"unknown parent '{parent}'"
+                break
+            node = parent
+        if reason is None and node in unplaceable:
+            reason = unplaceable[node]
+        for summary in reversed(path):
+            if reason is not None:
+                unplaceable[summary] = reason
+            else:
+                parent = str(by_summary[summary].get('Epic Link')).strip()
+                depth[summary] = depth[parent] + 1
+
+    levels: List[List[Dict]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for summary, level in depth.items():
+        levels[level].append(by_summary[summary])
+    return levels, rejected + sorted(unplaceable.items())
+
+
+def issue_fields(issue: Dict, project: str, parent_key: Optional[str], epic_link_field: str = 'parent',
+                 story_points_field: Optional[str] = None) -> Dict:
+    """Map a spec issue onto JIRA create-issue fields"""
+    description = str(issue.get('Description') or '')
+    for heading in ('Acceptance Criteria', 'Test Results'):
+        if issue.get(heading):
+            description += f"\n\n*{heading}*\n{issue[heading]}"
+
+    fields = {
+        'project': {'key': project},
+        'issuetype': {'name': issue.get('Issue Type') or 'Task'},
+        'summary': issue.get('Summary'),
+        'description': description.strip(),
+    }
+    if issue.get('Priority'):
+        fields['priority'] = {'name': issue['Priority']}
+    labels = [label.strip().replace(' ', '-') for label in str(issue.get('Labels') or '').split(',') if label.strip()]
+    if labels:
+        fields['labels'] = labels
+    components = [name.strip() for name in str(issue.get('Components') or '').split(',') if name.strip()]
+    if components:
+        fields['components'] = [{'name': name} for name in components]
+    if story_points_field and str(issue.get('Story Points') or '').strip():
+        fields[story_points_field] = float(issue['Story Points'])
+    if parent_key:
+        fields[epic_link_field] = {'key': parent_key} if epic_link_field == 'parent' else parent_key
+    return fields
+
+
+class PushResult:
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.failed: List[Tuple[str, str]] = []
+        self.requests = 0
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+
+def push_issues(issues: Iterable[Dict], client: JiraClient, state: PushState, project: str,
+                batch_size: int = MAX_BATCH_SIZE, concurrency: int = 4, epic_link_field: str = 'parent',
+                story_points_field: Optional[str] = None) -> PushResult:
+    """Create every issue not yet in ``state``, level by level"""
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    result = PushResult()
+    result_lock = threading.Lock()
+    started = time.monotonic()
+    requests_before = client.requests
+
+    levels, unplaceable = topological_levels(issues)
+    result.failed.extend(unplaceable)
+    key_of_summary = {str(issue.get('Summary')).strip(): issue_key(issue) for level in levels for issue in level}
+
+    def create_batch(ready: List[Dict], updates: List[Dict]) -> Tuple[List[Optional[str]], Dict[int, str]]:
+        keys: List[Optional[str]] = [None] * len(updates)
+        errors: Dict[int, str] = {}
+        pending = list(range(len(updates)))
+        for attempt in range(client.max_retries + 1):
+            try:
+                batch_keys, batch_errors = client.bulk_create([updates[i] for i in pending])
+            except JiraError as error:
+                if not error.unknown_outcome:
+                    errors.update((i, str(error)) for i in pending)
+                    break
+                # The batch may have been created anyway; only resend what JIRA does not have
+                try:
+                    existing = client.find_by_summary(project, [ready[i].get('Summary') for i in pending])
+                except JiraError as lookup_error:
+                    errors.update((i, f"{error}; could not check whether it was created: {lookup_error}")
+                                  for i in pending)
+                    break
+                for i in pending:
+                    keys[i] = existing.get(str(ready[i].get('Summary')).strip())
+                pending = [i for i in pending if keys[i] is None]
+                if not pending:
+                    break
+                if attempt == client.max_retries:
+                    errors.update((i, str(error)) for i in pending)
+                continue
+            for number, (i, jira_key) in enumerate(zip(pending, batch_keys)):
+                keys[i] = jira_key
+                if number in batch_errors:
+                    errors[i] = batch_errors[number]
+            break
+        return keys, errors
+
+    def push_batch(batch: List[Dict]) -> None:
+        ready, updates, failed = [], [], []
+        for issue in batch:
+            parent = str(issue.get('Epic Link') or '').strip()
+            parent_key = state.get(key_of_summary[parent]) if parent else None
+            if parent and parent_key is None:
+                failed.append((issue.get('Summary'), f"parent '{parent}' was not created"))
+                continue
+            ready.append(issue)
+            updates.append({'fields': issue_fields(issue, project, parent_key, epic_link_field, story_points_field)})
+
+        created = []
+        if updates:
+            keys, errors = create_batch(ready, updates)
+            for i, (issue, jira_key) in enumerate(zip(ready, keys)):
+                if jira_key:
+                    created.append((issue_key(issue), jira_key))
+                else:
+                    failed.append((issue.get('Summary'), errors.get(i, 'not created')))
+            state.record(created)
+
+        with result_lock:
+            result.created += len(created)
+            result.failed.extend(failed)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for level in levels:
+            pending = [issue for issue in level if issue_key(issue) not in state]
+            result.skipped += len(level) - len(pending)
+            batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+            # Finish the whole level before starting on its children
+            list(pool.map(push_batch, batches))
+
+    result.elapsed = time.monotonic() - started
+    result.requests = client.requests - requests_before
+    return result
@@ -0,0 +1,316 @@
+"""
+Repository scanner
+
+Derives JIRA tasks from the code itself instead of hand-typed counts: Express
+routes (``router.get/post/put/patch/delete`` in ``routes/*.js``, with mount
+prefixes read from the entry scripts), Mongoose models and test files.
+
+Files are scanned on a process pool. A cache keyed by path records each
+file's mtime, size, content hash and scan result, so a re-scan only reads
+files whose mtime or size changed and only re-parses those whose content
+actually did.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .spec import SpecError
+
+CACHE_VERSION = 1
+
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', 'coverage', '__pycache__'}
+SOURCE_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+
+# Below this many changed files the pool start-up costs more than it saves
+POOL_THRESHOLD = 32
+
+MAIN_EPIC = 'nu3PBnB Platform Development'
+TESTING_EPIC = 'Testing and Quality Assurance'
+
+# Route file stem -> epic
+STEM_EPICS = {
+    'auth': 'User Management System',
+    'users': 'User Management System',
+    'onboarding': 'User Management System',
+    'listings': 'Property Management System',
+    'host': 'Property Management System',
+    'bookings': 'Booking and Payment System',
+    'payments': 'Booking and Payment System',
+    'messages': 'Communication System',
+    'feedback': 'Communication System',
+    'content': 'Content Management System',
+    'analytics': 'Analytics and Reporting',
+    'admin': 'Admin Features',
+    'reviews': 'Review and Rating System',
+    'wishlist': 'Wishlist and Favorites',
+}
+
+# Path keyword -> epic, for route files that mix concerns (e.g. routes/api.js)
+KEYWORD_EPICS = [
+    ('wishlist', 'Wishlist and Favorites'),
+    ('review', 'Review and Rating System'),
+    ('admin', 'Admin Features'),
+    ('analytics', 'Analytics and Reporting'),
+    ('content', 'Content Management System'),
+    ('message', 'Communication System'),
+    ('feedback', 'Communication System'),
+    ('booking', 'Booking and Payment System'),
+    ('payment', 'Booking and Payment System'),
+    ('listing', 'Property Management System'),
+    ('host', 'Property Management System'),
+    ('search', 'Property Management System'),
+    ('auth', 'User Management System'),
+    ('user', 'User Management System'),
+    ('onboarding', 'User Management System'),
+]
+
+_ROUTE = re.compile(r'\brouter\.(get|post|put|patch|delete)\(\s*([\'"`])(.+?)\2')
+_MODEL = re.compile(r'\bmongoose\.model\(\s*[\'"](\w+)[\'"]')
+_REQUIRE = re.compile(r'\b(?:const|let|var)\s+(\w+)\s*=\s*require\(\s*[\'"]\./(routes/[\w\-/]+?)(?:\.js)?[\'"]\s*\)')
+_MOUNT = re.compile(r'\bapp\.use\(\s*[\'"](/[^\'"]*)[\'"]\s*,\s*(?:(\w+)|require\(\s*[\'"]\./(routes/[\w\-/]+?)(?:\.js)?[\'"]\s*\))\s*\)')
+_TEST_CASE = re.compile(r'(?<![\w.])(?:it|test)(?:\.only|\.skip)?\s*\(')
+_DESCRIBE = re.compile(r'(?<![\w.])describe(?:\.only|\.skip)?\s*\(')
+
+
+def classify(relpath: str) -> Optional[str]:
+    """'route', 'model', 'test' or 'entry' for files the scanner cares about"""
+    if not relpath.endswith(SOURCE_EXTENSIONS):
+        return None
+    parts = relpath.split('/')
+    name = parts[-1]
+    if '__tests__' in parts or '.test.' in name or '.spec.' in name:
+        return 'test'
+    if len(parts) == 2 and parts[0] == 'routes':
+        return 'route'
+    if len(parts) == 2 and parts[0] == 'models':
+        return 'model'
+    if len(parts) == 1:
+        return 'entry'
+    return None
+
+
+def scan_source(kind: str, text: str) -> Dict:
+    """Extract what matters for ``kind`` from one file's source"""
+    if kind == 'route':
+        return {'routes': [[method.upper(), path] for method, _, path in _ROUTE.findall(text)]}
+    if kind == 'model':
+        return {'models': _MODEL.findall(text)}
+    if kind == 'test':
+        return {'cases': len(_TEST_CASE.findall(text)), 'suites': len(_DESCRIBE.findall(text))}
+    requires = dict(_REQUIRE.findall(text))
+    mounts = [[prefix, f"{module or requires.get(name, '')}.js"] for prefix, name, module in _MOUNT.findall(text)
+              if module or name in requires]
+    return {'mounts': mounts}
+
+
+def _scan_job(job: Tuple[str, str, str, Optional[str]]) -> Tuple[str, str, Optional[Dict]]:
+    """Hash a file and scan it unless its content matches the cached hash"""
+    path, relpath, kind, known_hash = job
+    with open(path, 'rb') as handle:
+        content = handle.read()
+    digest = hashlib.sha1(content).hexdigest()
+    if digest == known_hash:
+        return relpath, digest, None
+    return relpath, digest, scan_source(kind, content.decode('utf-8', errors='replace'))
+
+
+def _walk(root: str) -> Iterator[Tuple[str, str, str, os.stat_result]]:
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            path = os.path.join(directory, filename)
+            relpath = os.path.relpath(path, root).replace(os.sep, '/')
+            kind = classify(relpath)
+            if kind:
+                yield path, relpath, kind, os.stat(path)
+
+
+def _load_cache(path: Optional[str]) -> Dict:
+    if path and os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                data = json.load(handle)
+            if data.get('version') == CACHE_VERSION:
+                return data['files']
+        except (OSError, ValueError, KeyError):
+            pass
+    return {}
+
+
+def _save_cache(path: Optional[str], files: Dict) -> None:
+    if not path:
+        return
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as handle:
+        json.dump({'version': CACHE_VERSION, 'files': files}, handle, separators=(',', ':'))
+    os.replace(temporary, path)
+
+
+def scan_repository(root: str, cache_path: Optional[str] = None, max_workers: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Scan ``root`` and return ``{relpath: {'kind': ..., **result}}`` for every
+    route, model, test and entry file, reusing cached results where possible.
+    """
+    cached = _load_cache(cache_path)
+    files: Dict[str, Dict] = {}
+    jobs = []
+
+    for path, relpath, kind, stat in _walk(root):
+        entry = cached.get(relpath)
+        if entry and entry['kind'] == kind and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            files[relpath] = entry
+            continue
+        files[relpath] = {'kind': kind, 'mtime': stat.st_mtime_ns, 'size': stat.st_size,
+                          'hash': None, 'result': entry['result'] if entry else None}
+        jobs.append((path, relpath, kind, entry['hash'] if entry and entry['kind'] == kind else None))
+
+    if len(jobs) < POOL_THRESHOLD or max_workers == 1:
+        results = [_scan_job(job) for job in jobs]
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_scan_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    for relpath, digest, result in results:
+        files[relpath]['hash'] = digest
+        if result is not None:
+            files[relpath]['result'] = result
+
+    if jobs or len(files) != len(cached):
+        _save_cache(cache_path, files)
+    return {relpath: {'kind': entry['kind'], **entry['result']} for relpath, entry in files.items()}
+
+
+def _keyword_epic(path: str) -> str:
+    lowered = path.lower()
+    for keyword, epic in KEYWORD_EPICS:
+        if keyword in lowered:
+            return epic
+    return MAIN_EPIC
+
+
+def _test_dir(relpath: str) -> str:
+    return relpath.rsplit('/', 1)[0] if '/' in relpath else '.'
+
+
+def derive_issues(files: Dict[str, Dict]) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Turn scan results into JIRA task rows mapped to the existing epics, plus
+    statistics that spec text can reference as ``{scan.<name>}``.
+    """
+    mounts = {}
+    for relpath, info in files.items():
+        if info['kind'] == 'entry':
+            for prefix, module in info['mounts']:
+                mounts[module] = prefix.rstrip('/')
+
+    tests = {relpath: info for relpath, info in files.items() if info['kind'] == 'test'}
+    tests_by_stem = {}
+    for relpath in tests:
+        stem = relpath.rsplit('/', 1)[-1].split('.', 1)[0]
+        tests_by_stem.setdefault(stem, []).append(relpath)
+
+    issues = []
+    endpoint_count = 0
+    for relpath in sorted(r for r, info in files.items() if info['kind'] == 'route'):
+        stem = relpath[len('routes/'):].rsplit('.', 1)[0]
+        prefix = mounts.get(relpath, f"/api/{stem}")
+        by_epic: Dict[str, List[str]] = {}
+        for method, path in files[relpath]['routes']:
+            endpoint = f"{method} {prefix}{'' if path == '/' else path}"
+            by_epic.setdefault(STEM_EPICS.get(stem) or _keyword_epic(path), []).append(endpoint)
+            endpoint_count += 1
+
+        test_files = [t for t in tests_by_stem.get(stem, []) if t.startswith('routes/')]
+        cases = sum(tests[t]['cases'] for t in test_files)
+        test_results = (f"{cases} test cases in {', '.join(test_files)}" if test_files
+                        else 'No route tests found under routes/__tests__')
+
+        for epic, endpoints in sorted(by_epic.items()):
+            split = len(by_epic) > 1
+            slug = re.sub(r'[^a-z0-9]+', '-', epic.lower()).strip('-')
+            issues.append({
+                'Key': f"scan-route-{stem}-{slug}" if split else f"scan-route-{stem}",
+                'Issue Type': 'Task',
+                'Epic Link': epic,
+                'Summary': f"API routes: {relpath}" + (f" ({epic})" if split else ''),
+                'Description': f"{len(endpoints)} Express endpoints in {relpath}: {'; '.join(endpoints)}",
+                'Priority': 'Medium',
+                'Labels': 'api,express,scanned',
+                'Components': 'Backend',
+                'Acceptance Criteria': f"All {len(endpoints)} endpoints implemented, documented and covered by tests",
+                'Test Results': test_results,
+            })
+
+    models = sorted((name, relpath) for relpath, info in files.items() if info['kind'] == 'model'
+                    for name in info['models'])
+    model_tests = sorted(t for t in tests if t.startswith('models/'))
+    if models:
+        issues.append({
+            'Key': 'scan-models',
+            'Issue Type': 'Task',
+            'Epic Link': MAIN_EPIC,
+            'Summary': 'Mongoose data models',
+            'Description': f"{len(models)} models: " + '; '.join(f"{name} ({path})" for name, path in models),
+            'Priority': 'Medium',
+            'Labels': 'mongodb,mongoose,scanned',
+            'Components': 'Backend',
+            'Acceptance Criteria': 'Every model has schema validation and unit tests',
+            'Test Results': (f"{sum(tests[t]['cases'] for t in model_tests)} test cases in {len(model_tests)} model test file(s)"
+                             if model_tests else 'No model tests found'),
+        })
+
+    by_dir: Dict[str, List[str]] = {}
+    for relpath in sorted(tests):
+        by_dir.setdefault(_test_dir(relpath), []).append(relpath)
+    test_cases = sum(info['cases'] for info in tests.values())
+    if tests:
+        issues.append({
+            'Key': 'scan-test-inventory',
+            'Issue Type': 'Task',
+            'Epic Link': TESTING_EPIC,
+            'Summary': 'Automated test inventory',
+            'Description': f"{len(tests)} test suites with {test_cases} test cases: "
+                           + '; '.join(f"{directory} ({len(paths)})" for directory, paths in by_dir.items()),
+            'Priority': 'Medium',
+            'Labels': 'testing,jest,scanned',
+            'Components': 'Testing',
+            'Acceptance Criteria': 'Every route file and model has a matching test suite',
+            'Test Results': f"{len(tests)} test suites, {test_cases} test cases",
+        })
+
+    stats = {
+        'test_suites': len(tests),
+        'test_cases': test_cases,
+        'route_files': sum(1 for info in files.values() if info['kind'] == 'route'),
+        'endpoints': endpoint_count,
+        'models': len(models),
+    }
+    return issues, stats
+
+
+_PLACEHOLDER = re.compile(r'\{scan\.(\w+)\}')
+
+
+def fill_placeholders(issue: Dict, stats: Optional[Dict[str, int]]) -> Dict:
+    """
+    Replace ``{scan.<name>}`` in string fields with scanned statistics.
+    ``stats`` is None when the repository was not scanned; a placeholder that
+    cannot be filled raises SpecError rather than reaching JIRA as raw text.
+    """
+    def replace(match):
+        if stats is None:
+            raise SpecError(f"'{issue.get('Summary')}' uses {match.group(0)}, which needs the repository scan "
+                            f"(run without --no-scan)")
+        value = stats.get(match.group(1))
+        if value is None:
+            raise SpecError(f"'{issue.get('Summary')}' uses unknown placeholder {match.group(0)} "
+                            f"(known: {', '.join(sorted(stats))})")
+        return str(value)
+
+    return {key: _PLACEHOLDER.sub(replace, value) if isinstance(value, str) else value
+            for key, value in issue.items()}
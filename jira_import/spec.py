@@ -0,0 +1,209 @@
+"""
+JIRA import specs
+
+Issues are declared in spec files rather than in code. A spec is a JSON list
+of issue objects (``.json``), one issue object per line (``.jsonl``), or a
+YAML list or multi-document stream (``.yaml``/``.yml``, requires PyYAML).
+JSON Lines and multi-document YAML are read incrementally, so they are the
+formats to use for very large backlogs.
+
+Issue objects use the CSV column names as keys; missing columns are written
+as empty cells.
+"""
+
+import csv
+import json
+import os
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+FIELDNAMES = [
+    'Issue Type', 'Epic Link', 'Summary', 'Description', 'Priority',
+    'Story Points', 'Labels', 'Components', 'Acceptance Criteria', 'Test Results'
+]
+
+SPEC_EXTENSIONS = ('.json', '.jsonl', '.yaml', '.yml')
+
+
+class SpecError(ValueError):
+    """A spec file could not be read"""
+
+
+def _load_json(path: str) -> Iterator[Dict]:
+    with open(path, encoding='utf-8') as handle:
+        data = json.load(handle)
+    if isinstance(data, dict):
+        data = data.get('issues', [])
+    if not isinstance(data, list):
+        raise SpecError(f"{path}: expected a list of issues")
+    yield from data
+
+
+def _load_jsonl(path: str) -> Iterator[Dict]:
+    with open(path, encoding='utf-8') as handle:
+        for line_number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                raise SpecError(f"{path}:{line_number}: {error}") from error
+
+
+def _load_yaml(path: str) -> Iterator[Dict]:
+    try:
+        import yaml
+    except ImportError as error:
+        raise SpecError(f"{path}: PyYAML is required for YAML specs (pip install pyyaml)") from error
+    with open(path, encoding='utf-8') as handle:
+        for document in yaml.safe_load_all(handle):
+            if document is None:
+                continue
+            if isinstance(document, dict) and 'issues' in document:
+                document = document['issues']
+            if isinstance(document, list):
+                yield from document
+            else:
+                yield document
+
+
+_LOADERS = {
+    '.json': _load_json,
+    '.jsonl': _load_jsonl,
+    '.yaml': _load_yaml,
+    '.yml': _load_yaml,
+}
+
+
+def spec_files(paths: Iterable[str]) -> List[str]:
+    """Expand directories into the spec files they contain, in name order"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if os.path.splitext(name)[1] in SPEC_EXTENSIONS
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def iter_issues(paths: Iterable[str]) -> Iterator[Dict]:
+    """Stream issues from each spec file in turn"""
+    for path in spec_files(paths):
+        loader = _LOADERS.get(os.path.splitext(path)[1].lower())
+        if loader is None:
+            raise SpecError(f"{path}: unsupported spec format")
+        for issue in loader(path):
+            if not isinstance(issue, dict):
+                raise SpecError(f"{path}: every issue must be an object")
+            yield issue
+
+
+def _points(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class HierarchyIndex:
+    """
+    Summary -> issue index built while issues stream past.
+
+    Only the issue type, parent summary and story points are kept per issue,
+    which is enough to validate ``Epic Link`` references, detect cycles,
+    count issue types and roll leaf story points up the hierarchy. Links may
+    point forward to issues that appear later in the stream; anything still
+    unresolved at the end is reported as dangling.
+    """
+
+    def __init__(self):
+        self.issues: Dict[str, Tuple[str, Optional[str], float]] = {}
+        self.type_counts: Counter = Counter()
+        self.total_points = 0.0
+        self.duplicates: List[str] = []
+        self.missing_summary = 0
+        self._waiting: Dict[str, List[str]] = defaultdict(list)
+
+    def add(self, issue: Dict) -> None:
+        summary = str(issue.get('Summary') or '').strip()
+        issue_type = str(issue.get('Issue Type') or '').strip()
+        parent = str(issue.get('Epic Link') or '').strip() or None
+        points = _points(issue.get('Story Points'))
+
+        self.type_counts[issue_type] += 1
+        self.total_points += points
+        if not summary:
+            self.missing_summary += 1
+            return
+        if summary in self.issues:
+            self.duplicates.append(summary)
+            return
+
+        self.issues[summary] = (issue_type, parent, points)
+        self._waiting.pop(summary, None)
+        if parent is not None and parent not in self.issues:
+            self._waiting[parent].append(summary)
+
+    def track(self, issues: Iterable[Dict]) -> Iterator[Dict]:
+        """Index issues as they are consumed, passing each one through"""
+        for issue in issues:
+            self.add(issue)
+            yield issue
+
+    @property
+    def dangling(self) -> List[Tuple[str, str]]:
+        """(child, missing parent) pairs"""
+        return [(child, parent) for parent, children in self._waiting.items() for child in children]
+
+    def cycles(self) -> List[List[str]]:
+        """Each cycle in the parent links, as the list of summaries on it"""
+        walk_of: Dict[str, str] = {}
+        found = []
+        for start in self.issues:
+            path = []
+            node = start
+            while node is not None and node in self.issues and node not in walk_of:
+                walk_of[node] = start
+                path.append(node)
+                node = self.issues[node][1]
+            if node is not None and walk_of.get(node) == start:
+                found.append(path[path.index(node):])
+        return found
+
+    def rollups(self) -> Dict[str, float]:
+        """
+        Story points of the leaf issues under each issue that has any. Only
+        leaves count, so a sub-epic's own estimate is never added on top of
+        the work beneath it.
+        """
+        parents = {parent for _, parent, _ in self.issues.values() if parent is not None}
+        totals: Dict[str, float] = defaultdict(float)
+        for summary, (_, parent, points) in self.issues.items():
+            if summary in parents:
+                continue
+            seen = {summary}
+            while parent is not None and parent in self.issues and parent not in seen:
+                totals[parent] += points
+                seen.add(parent)
+                parent = self.issues[parent][1]
+        return dict(totals)
+
+
+def csv_row(issue: Dict) -> Dict:
+    """Project an issue onto the CSV columns"""
+    return {field: issue.get(field, '') for field in FIELDNAMES}
+
+
+def write_csv(issues: Iterable[Dict], csvfile) -> int:
+    """Stream issues into an open CSV file, returning the number of rows"""
+    writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    count = 0
+    for issue in issues:
+        writer.writerow(csv_row(issue))
+        count += 1
+    return count
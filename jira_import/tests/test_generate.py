@@ -0,0 +1,103 @@
+import csv
+import importlib.util
+import json
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='module')
+def generator():
+    # The script's file name is not importable as a module name
+    spec = importlib.util.spec_from_file_location('generate_jira_import', os.path.join(ROOT, 'generate-jira-import.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_spec(path, issues):
+    path.write_text(json.dumps(issues), encoding='utf-8')
+    return str(path)
+
+
+def rows(path):
+    with open(path, newline='', encoding='utf-8') as handle:
+        return list(csv.DictReader(handle))
+
+
+EPIC = {'Issue Type': 'Epic', 'Summary': 'Platform', 'Story Points': '5'}
+STORY = {'Issue Type': 'Story', 'Epic Link': 'Platform', 'Summary': 'Login', 'Story Points': '3'}
+
+
+def run_incremental(generator, tmp_path, spec, jira_keys=None):
+    return generator.generate_incremental_import([spec], str(tmp_path / 'out.csv'), scan_root=None,
+                                                 jira_keys_path=jira_keys)
+
+
+def test_incremental_writes_changes_with_their_jira_key(generator, tmp_path, capsys):
+    spec = write_spec(tmp_path / 'spec.json', [EPIC, STORY])
+    assert run_incremental(generator, tmp_path, spec)
+    assert [row['Summary'] for row in rows(tmp_path / 'out.csv')] == ['Platform', 'Login']
+
+    export = tmp_path / 'export.csv'
+    export.write_text('Issue key,Summary\nSHT-1,Platform\nSHT-2,Login\n', encoding='utf-8')
+    write_spec(tmp_path / 'spec.json', [{**EPIC, 'Story Points': '8'}, STORY])
+    capsys.readouterr()
+    assert run_incremental(generator, tmp_path, spec, str(export))
+
+    assert rows(tmp_path / 'out.csv') == []
+    updates = rows(tmp_path / 'out-updates.csv')
+    assert [(row['Issue Key'], row['Summary'], row['Story Points']) for row in updates] == [('SHT-1', 'Platform', '8')]
+    assert '- 1 unchanged (skipped)' in capsys.readouterr().out
+
+
+def test_changes_without_a_jira_key_are_held_back(generator, tmp_path, capsys):
+    spec = write_spec(tmp_path / 'spec.json', [EPIC, STORY])
+    run_incremental(generator, tmp_path, spec)
+    write_spec(tmp_path / 'spec.json', [{**EPIC, 'Story Points': '8'}, STORY])
+    capsys.readouterr()
+    run_incremental(generator, tmp_path, spec)
+
+    output = capsys.readouterr()
+    assert rows(tmp_path / 'out-updates.csv') == []
+    assert '- 1 changed but not written' in output.out
+    assert '- 1 unchanged (skipped)' in output.out
+    assert "'Platform' changed but its JIRA key is unknown" in output.err
+
+    # Offered again once the key is known
+    export = tmp_path / 'export.csv'
+    export.write_text('Issue key,Summary\nSHT-1,Platform\n', encoding='utf-8')
+    run_incremental(generator, tmp_path, spec, str(export))
+    assert [row['Issue Key'] for row in rows(tmp_path / 'out-updates.csv')] == ['SHT-1']
+
+
+def test_deleted_issues_are_reported_with_their_jira_key(generator, tmp_path):
+    spec = write_spec(tmp_path / 'spec.json', [EPIC, STORY])
+    export = tmp_path / 'export.csv'
+    export.write_text('Issue key,Summary\nSHT-1,Platform\nSHT-2,Login\n', encoding='utf-8')
+    run_incremental(generator, tmp_path, spec, str(export))
+    write_spec(tmp_path / 'spec.json', [EPIC])
+    run_incremental(generator, tmp_path, spec)
+
+    assert rows(tmp_path / 'out-deletions.csv') == [
+        {'Key': 'login', 'Issue Key': 'SHT-2', 'Issue Type': 'Story', 'Summary': 'Login'}]
+
+
+def test_key_collisions_fail_the_run(generator, tmp_path, capsys):
+    spec = write_spec(tmp_path / 'spec.json', [EPIC, {**STORY, 'Summary': 'PLATFORM!', 'Epic Link': ''}])
+    assert not run_incremental(generator, tmp_path, spec)
+    assert "has the same key 'platform'" in capsys.readouterr().err
+    assert [row['Summary'] for row in rows(tmp_path / 'out.csv')] == ['Platform']
+
+
+def test_no_scan_never_writes_raw_placeholders(generator, tmp_path):
+    spec = write_spec(tmp_path / 'spec.json', [{**EPIC, 'Test Results': 'All {scan.test_suites} suites'}])
+    with pytest.raises(generator.SpecError, match='needs the repository scan'):
+        generator.generate_jira_import([spec], str(tmp_path / 'out.csv'), scan_root=None)
+    assert '{scan.' not in (tmp_path / 'out.csv').read_text(encoding='utf-8')
+
+    write_spec(tmp_path / 'spec.json', [EPIC, STORY])
+    assert generator.generate_jira_import([spec], str(tmp_path / 'out.csv'), scan_root=None)
+    assert len(rows(tmp_path / 'out.csv')) == 2
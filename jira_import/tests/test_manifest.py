@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from jira_import.manifest import (CHANGED, COLLISION, NEW, UNCHANGED, Manifest, deleted_entries, diff_issues,
+                                  issue_key, load_jira_keys)
+
+
+def issue(summary, **fields):
+    return {'Summary': summary, 'Issue Type': 'Task', **fields}
+
+
+def diff(issues, previous, jira_keys=None):
+    current = Manifest()
+    return [(status, key) for status, key, _ in diff_issues(issues, previous, current, jira_keys)], current
+
+
+def test_keys_are_explicit_or_summary_slugs():
+    assert issue_key(issue('Build the Host Dashboard!')) == 'build-the-host-dashboard'
+    assert issue_key(issue('Anything', Key=' HOST-1 ')) == 'HOST-1'
+
+
+def test_first_run_reports_everything_new():
+    statuses, current = diff([issue('One'), issue('Two')], Manifest())
+    assert statuses == [(NEW, 'one'), (NEW, 'two')]
+    assert len(current) == 2
+
+
+def test_rerun_classifies_changes_and_deletions():
+    _, previous = diff([issue('One'), issue('Two'), issue('Three')], Manifest())
+    statuses, current = diff([issue('One'), issue('Two', Priority='High'), issue('Four')], previous)
+    assert statuses == [(UNCHANGED, 'one'), (CHANGED, 'two'), (NEW, 'four')]
+    assert deleted_entries(previous, current) == [('three', '', 'Task', 'Three')]
+
+
+def test_colliding_keys_are_reported_and_not_recorded():
+    statuses, current = diff([issue('Host dashboard'), issue('Host: dashboard', Priority='Low')], Manifest())
+    assert statuses == [(NEW, 'host-dashboard'), (COLLISION, 'host-dashboard')]
+    assert current.entries['host-dashboard'][2] == 'Host dashboard'
+
+
+def test_jira_keys_are_recorded_and_carried_forward():
+    _, previous = diff([issue('One'), issue('Two')], Manifest(), {'one': 'SHT-1'})
+    assert previous.jira_key('one') == 'SHT-1'
+    assert previous.jira_key('two') == ''
+    _, current = diff([issue('One'), issue('Two')], previous, {'two': 'SHT-2'})
+    assert (current.jira_key('one'), current.jira_key('two')) == ('SHT-1', 'SHT-2')
+
+
+def test_manifest_round_trips_and_rejects_other_versions(tmp_path):
+    path = str(tmp_path / 'manifest.json')
+    _, manifest = diff([issue('One')], Manifest(), {'one': 'SHT-1'})
+    manifest.save(path)
+    assert Manifest.load(path).entries == manifest.entries
+    assert not (tmp_path / 'manifest.json.tmp').exists()
+
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump({'version': 99, 'issues': {}}, handle)
+    with pytest.raises(ValueError):
+        Manifest.load(path)
+    assert len(Manifest.load(str(tmp_path / 'missing.json'))) == 0
+
+
+def test_jira_keys_load_from_push_state_and_csv_export(tmp_path):
+    state = tmp_path / 'state.jsonl'
+    state.write_text('{"key": "one", "jira": "SHT-1"}\n\n{"key": "two", "jira": "SHT-2"}\n', encoding='utf-8')
+    assert load_jira_keys(str(state)) == {'one': 'SHT-1', 'two': 'SHT-2'}
+
+    export = tmp_path / 'export.csv'
+    export.write_text('Issue key,Summary,Status\nSHT-7,Host dashboard!,Done\n,No key,Open\n', encoding='utf-8')
+    assert load_jira_keys(str(export)) == {'host-dashboard': 'SHT-7'}
+
+    assert load_jira_keys(str(tmp_path / 'missing.csv')) == {}
+    assert load_jira_keys(None) == {}
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from jira_import.mock_server import MockJiraServer
+from jira_import.push import JiraClient, PushState, push_issues, topological_levels
+
+
+def issue(summary, parent='', issue_type='Task', **fields):
+    return {'Summary': summary, 'Epic Link': parent, 'Issue Type': issue_type, **fields}
+
+
+def backlog(epics=3, stories=4, tasks=2):
+    issues = []
+    for e in range(epics):
+        epic = f"Epic {e}"
+        issues.append(issue(epic, issue_type='Epic'))
+        for s in range(stories):
+            story = f"{epic} story {s}"
+            issues.append(issue(story, epic, 'Story'))
+            issues.extend(issue(f"{story} task {t}", story) for t in range(tasks))
+    return issues
+
+
+def client_for(server, **options):
+    return JiraClient(server.url, timeout=5.0, backoff=0.01, **options)
+
+
+def summaries(level):
+    return sorted(item['Summary'] for item in level)
+
+
+def test_levels_put_parents_first():
+    levels, failed = topological_levels([issue('Task', 'Story'), issue('Story', 'Epic'), issue('Epic')])
+    assert [summaries(level) for level in levels] == [['Epic'], ['Story'], ['Task']]
+    assert failed == []
+
+
+def test_levels_report_cycles_and_missing_parents():
+    levels, failed = topological_levels([issue('A', 'B'), issue('B', 'A'), issue('C', 'Gone'), issue('D', 'C'),
+                                         issue('E')])
+    assert [summaries(level) for level in levels] == [['E']]
+    assert {summary for summary, _ in failed} == {'A', 'B', 'C', 'D'}
+    assert dict(failed)['C'] == "unknown parent 'Gone'"
+
+
+def test_levels_report_duplicate_and_empty_summaries():
+    levels, failed = topological_levels([issue('Epic', issue_type='Epic'), issue('Epic', description='again'),
+                                         issue(''), issue('Other', Key='epic')])
+    assert [summaries(level) for level in levels] == [['Epic']]
+    reasons = dict(failed)
+    assert reasons['Epic'].startswith('duplicate summary')
+    assert reasons[''] == 'Task without a summary'
+    assert reasons['Other'] == "same key 'epic' as 'Epic'"
+
+
+def test_push_links_children_to_created_parents(tmp_path):
+    issues = backlog()
+    with MockJiraServer() as server:
+        result = push_issues(issues, client_for(server), PushState(str(tmp_path / 'state.jsonl')), 'SHT',
+                             batch_size=5)
+        created = server.jira.issues
+
+    assert result.failed == []
+    assert result.created == len(issues) == len(created)
+    key_of = {fields['fields']['summary']: key for key, fields in created.items()}
+    for item in issues:
+        if item['Epic Link']:
+            assert created[key_of[item['Summary']]]['fields']['parent'] == {'key': key_of[item['Epic Link']]}
+
+
+def test_rerun_skips_created_issues(tmp_path):
+    state_path = str(tmp_path / 'state.jsonl')
+    issues = backlog()
+    with MockJiraServer() as server:
+        first = push_issues(issues, client_for(server), PushState(state_path), 'SHT')
+        second = push_issues(issues + [issue('Late task', 'Epic 0')], client_for(server), PushState(state_path), 'SHT')
+        total = len(server.jira.issues)
+
+    assert first.created == len(issues)
+    assert (second.created, second.skipped, second.failed) == (1, len(issues), [])
+    assert total == len(issues) + 1
+    with open(state_path, encoding='utf-8') as handle:
+        assert len([json.loads(line) for line in handle]) == total
+
+
+def test_rate_limits_and_transient_failures_are_retried(tmp_path):
+    issues = backlog()
+    with MockJiraServer(rate_limit=5, failure_rate=0.3) as server:
+        client = client_for(server, max_retries=10)
+        result = push_issues(issues, client, PushState(str(tmp_path / 'state.jsonl')), 'SHT', batch_size=4)
+        total = len(server.jira.issues)
+        received = server.jira.requests
+
+    assert result.failed == []
+    assert result.created == total == len(issues)
+    assert client.retries > 0
+    assert result.requests == received
+
+
+@pytest.mark.parametrize('lost_response_rate', [0.5, 1.0])
+def test_lost_responses_do_not_create_duplicates(tmp_path, lost_response_rate):
+    issues = backlog(tasks=3)
+    with MockJiraServer(lost_response_rate=lost_response_rate) as server:
+        result = push_issues(issues, client_for(server), PushState(str(tmp_path / 'state.jsonl')), 'SHT',
+                             batch_size=4)
+        created = [fields['fields']['summary'] for fields in server.jira.issues.values()]
+        lost = server.jira.lost_responses
+        received = server.jira.requests
+
+    assert lost > 0
+    assert result.failed == []
+    # Lookups after lost responses are counted too
+    assert result.requests == received
+    assert sorted(created) == sorted(item['Summary'] for item in issues)
@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+from jira_import import scanner
+from jira_import.scanner import classify, derive_issues, fill_placeholders, scan_repository, scan_source
+from jira_import.spec import SpecError
+
+ENTRY = """
+const listingRoutes = require('./routes/listings');
+app.use('/api/listings', listingRoutes);
+app.use('/api', require('./routes/api'));
+"""
+LISTINGS = """
+router.get('/', list);
+router.get("/:id", show);
+router.post(`/`, auth, create);
+"""
+API = """
+router.get('/users/:id/wishlist', getWishlist);
+router.post('/reviews', createReview);
+"""
+MODEL = "module.exports = mongoose.model('Listing', listingSchema);"
+TESTS = """
+describe('listings', () => {
+  it('lists', () => {});
+  test.skip('creates', () => {});
+  helper.it('is not a test');
+});
+"""
+
+
+def write(root, relpath, text):
+    path = os.path.join(root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(text)
+    return path
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = str(tmp_path)
+    write(root, 'index.js', ENTRY)
+    write(root, 'routes/listings.js', LISTINGS)
+    write(root, 'routes/api.js', API)
+    write(root, 'routes/__tests__/listings.test.js', TESTS)
+    write(root, 'models/Listing.js', MODEL)
+    write(root, 'node_modules/pkg/routes/x.js', LISTINGS)
+    write(root, 'README.md', 'not scanned')
+    return root
+
+
+def test_files_are_classified_by_path():
+    assert classify('routes/listings.js') == 'route'
+    assert classify('routes/__tests__/listings.test.js') == 'test'
+    assert classify('models/User.js') == 'model'
+    assert classify('index.js') == 'entry'
+    assert classify('routes/nested/deep.js') is None
+    assert classify('README.md') is None
+
+
+def test_sources_are_scanned_per_kind():
+    assert scan_source('route', LISTINGS) == {'routes': [['GET', '/'], ['GET', '/:id'], ['POST', '/']]}
+    assert scan_source('model', MODEL) == {'models': ['Listing']}
+    assert scan_source('test', TESTS) == {'cases': 2, 'suites': 1}
+    assert scan_source('entry', ENTRY) == {'mounts': [['/api/listings', 'routes/listings.js'],
+                                                      ['/api', 'routes/api.js']]}
+
+
+def test_derived_issues_use_mount_prefixes_and_split_mixed_files(repo):
+    issues, stats = derive_issues(scan_repository(repo))
+    by_key = {issue['Key']: issue for issue in issues}
+
+    listings = by_key['scan-route-listings']
+    assert listings['Epic Link'] == 'Property Management System'
+    assert 'GET /api/listings; GET /api/listings/:id; POST /api/listings' in listings['Description']
+    assert listings['Test Results'] == '2 test cases in routes/__tests__/listings.test.js'
+
+    assert by_key['scan-route-api-wishlist-and-favorites']['Epic Link'] == 'Wishlist and Favorites'
+    assert by_key['scan-route-api-review-and-rating-system']['Description'].endswith('POST /api/reviews')
+    assert 'Listing (models/Listing.js)' in by_key['scan-models']['Description']
+    assert stats == {'test_suites': 1, 'test_cases': 2, 'route_files': 2, 'endpoints': 5, 'models': 1}
+
+
+def test_rescans_reuse_cached_results(repo, monkeypatch):
+    cache = os.path.join(repo, '.jira-scan-cache.json')
+    parsed = []
+    real_scan_source = scanner.scan_source
+
+    def counting_scan_source(kind, text):
+        parsed.append(kind)
+        return real_scan_source(kind, text)
+
+    monkeypatch.setattr(scanner, 'scan_source', counting_scan_source)
+    first = scan_repository(repo, cache_path=cache)
+    assert len(parsed) == 5
+
+    parsed.clear()
+    assert scan_repository(repo, cache_path=cache) == first
+    assert parsed == []
+
+    # Touched but identical content is hashed, not parsed again
+    path = os.path.join(repo, 'routes/listings.js')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert scan_repository(repo, cache_path=cache) == first
+    assert parsed == []
+
+    write(repo, 'routes/listings.js', LISTINGS + "router.delete('/:id', remove);\n")
+    rescanned = scan_repository(repo, cache_path=cache)
+    assert parsed == ['route']
+    assert rescanned['routes/listings.js']['routes'][-1] == ['DELETE', '/:id']
+
+
+def test_placeholders_are_filled_from_scan_statistics():
+    issue = {'Summary': 'Tests', 'Test Results': 'All {scan.test_suites} suites', 'Story Points': 3}
+    assert fill_placeholders(issue, {'test_suites': 12}) == {**issue, 'Test Results': 'All 12 suites'}
+
+
+def test_unfilled_placeholders_are_errors():
+    issue = {'Summary': 'Tests', 'Test Results': 'All {scan.test_suites} suites'}
+    with pytest.raises(SpecError, match='needs the repository scan'):
+        fill_placeholders(issue, None)
+    with pytest.raises(SpecError, match='unknown placeholder'):
+        fill_placeholders(issue, {'models': 3})
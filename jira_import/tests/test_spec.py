@@ -0,0 +1,66 @@
+import io
+import json
+
+from jira_import.spec import FIELDNAMES, HierarchyIndex, iter_issues, write_csv
+
+
+def issue(summary, parent='', issue_type='Task', points=''):
+    return {'Summary': summary, 'Epic Link': parent, 'Issue Type': issue_type, 'Story Points': points}
+
+
+def indexed(issues):
+    index = HierarchyIndex()
+    list(index.track(issues))
+    return index
+
+
+def test_forward_links_resolve_and_missing_parents_dangle():
+    index = indexed([issue('Story', 'Epic'), issue('Epic', issue_type='Epic'), issue('Orphan', 'Gone')])
+    assert index.dangling == [('Orphan', 'Gone')]
+    assert index.type_counts['Task'] == 2
+
+
+def test_cycles_are_reported_once():
+    index = indexed([issue('A', 'B'), issue('B', 'C'), issue('C', 'A'), issue('D', 'A'), issue('E')])
+    cycles = index.cycles()
+    assert len(cycles) == 1
+    assert sorted(cycles[0]) == ['A', 'B', 'C']
+
+
+def test_duplicates_and_missing_summaries_are_counted():
+    index = indexed([issue('A'), issue('A'), issue(''), issue('  ')])
+    assert index.duplicates == ['A']
+    assert index.missing_summary == 2
+
+
+def test_rollups_sum_only_leaf_issues():
+    index = indexed([
+        issue('Platform', issue_type='Epic', points=100),
+        issue('Sub-epic', 'Platform', 'Epic', points=40),
+        issue('Story', 'Sub-epic', 'Story', points=8),
+        issue('Task 1', 'Story', points=3),
+        issue('Task 2', 'Story', points=2),
+        issue('Leaf story', 'Platform', 'Story', points=5),
+    ])
+    rollups = index.rollups()
+    assert rollups == {'Platform': 10, 'Sub-epic': 5, 'Story': 5}
+    assert index.total_points == 158
+
+
+def test_rollups_stop_at_cycles():
+    index = indexed([issue('A', 'B', points=1), issue('B', 'A', points=1), issue('Leaf', 'A', points=2)])
+    assert index.rollups() == {'A': 2, 'B': 2}
+
+
+def test_specs_stream_from_json_and_jsonl(tmp_path):
+    (tmp_path / 'a.json').write_text(json.dumps({'issues': [issue('One')]}), encoding='utf-8')
+    (tmp_path / 'b.jsonl').write_text('# comment\n' + json.dumps(issue('Two')) + '\n\n', encoding='utf-8')
+    assert [item['Summary'] for item in iter_issues([str(tmp_path)])] == ['One', 'Two']
+
+
+def test_csv_has_every_column():
+    output = io.StringIO()
+    assert write_csv([{'Summary': 'One', 'Unknown': 'x'}], output) == 1
+    header, row = output.getvalue().splitlines()
+    assert header.split(',') == FIELDNAMES
+    assert 'x' not in row